@@ -20,6 +20,7 @@ django.setup()
 from settings import (
     LOCAL_DATA_DIRECTORY,
     LOCAL_DATA_LOGS_DIRECTORY,
+    LOCAL_DATA_RECORDINGS_DIRECTORY,
 )
 
 from django.core.management import (
@@ -38,6 +39,7 @@ def handle_local_directories():
     for directory in [
         LOCAL_DATA_DIRECTORY,
         LOCAL_DATA_LOGS_DIRECTORY,
+        LOCAL_DATA_RECORDINGS_DIRECTORY,
     ]:
         if not os.path.exists(directory):
             os.makedirs(directory)
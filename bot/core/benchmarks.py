@@ -0,0 +1,107 @@
+from settings import (
+    BOT_DATA_IMAGES_DIRECTORY,
+)
+
+from bot.core.source import ReplaySource
+from bot.core.templates import TemplateStore
+from bot.core.imagesearch import (
+    _match,
+    match_pyramid,
+)
+
+import time
+import sys
+
+
+def benchmark_pyramid(
+    path,
+    images=None,
+    precision=0.8,
+    frames=None,
+    **pyramid
+):
+    """
+    Benchmark the pyramid matcher against the full resolution matcher, every template is searched for
+    across each full frame in the replay path specified (recorder archive, zip file or image directory).
+
+    Speed is measured for both matchers, agreement is measured by comparing whether or not each template
+    was found (within our precision) and the position returned when both matchers found it.
+    """
+    source = ReplaySource(path=path, loop=False)
+    templates = TemplateStore()
+    templates.load_directory(directory=BOT_DATA_IMAGES_DIRECTORY)
+
+    if images:
+        templates = [template for template in templates.templates.values() if template.name in images]
+    else:
+        templates = list(templates.templates.values())
+
+    results = {
+        "frames": 0,
+        "searches": 0,
+        "full_time": 0.0,
+        "pyramid_time": 0.0,
+        "agreed": 0,
+        "found": 0,
+        "missed": 0,
+        "moved": 0,
+    }
+
+    for index in range(min(len(source.names), frames or len(source.names))):
+        img_gray = source.screenshot().gray
+
+        for template in templates:
+            if template.height > img_gray.shape[0] or template.width > img_gray.shape[1]:
+                continue
+
+            timestamp = time.perf_counter()
+            full_val, full_loc = _match(img_gray=img_gray, template=template.gray)
+            results["full_time"] += time.perf_counter() - timestamp
+
+            timestamp = time.perf_counter()
+            pyramid_val, pyramid_loc = match_pyramid(
+                img_gray=img_gray,
+                template=template.gray,
+                precision=precision,
+                **pyramid
+            )
+            results["pyramid_time"] += time.perf_counter() - timestamp
+
+            full_found, pyramid_found = (
+                full_val >= precision,
+                pyramid_val >= precision,
+            )
+            results["searches"] += 1
+            results["found"] += full_found
+
+            if full_found and not pyramid_found:
+                # False negatives are the important ones here,
+                # the pyramid matcher missed a valid match.
+                results["missed"] += 1
+            elif full_found and tuple(full_loc) != tuple(pyramid_loc):
+                results["moved"] += 1
+            elif full_found == pyramid_found:
+                results["agreed"] += 1
+        results["frames"] += 1
+
+    results["speedup"] = results["full_time"] / results["pyramid_time"] if results["pyramid_time"] else 0.0
+    results["agreement"] = results["agreed"] / results["searches"] if results["searches"] else 0.0
+
+    return results
+
+
+if __name__ == "__main__":
+    # Usage: python -m bot.core.benchmarks <replay path> [image name]...
+    results = benchmark_pyramid(
+        path=sys.argv[1],
+        images=sys.argv[2:],
+    )
+    print(
+        "Frames: %(frames)s, Searches: %(searches)s (%(found)s Found)\n"
+        "Full Resolution: %(full_time).3f Second(s)\n"
+        "Pyramid: %(pyramid_time).3f Second(s) (%(speedup).2fx)\n"
+        "Agreement: %(agreement).2f%% (%(missed)s Missed, %(moved)s Moved)" % dict(
+            results,
+            agreement=results["agreement"] * 100,
+        )
+    )
@@ -2,16 +2,34 @@ from settings import (
     BOT_DATA_IMAGES_DIRECTORY,
     BOT_DATA_SCHEMA_CONFIGURATION_FILE,
     LOCAL_DATA_LOGS_DIRECTORY,
+    LOCAL_DATA_RECORDINGS_DIRECTORY,
+    LOCAL_DATA_SCREENS_FILE,
 )
 
-from bot.core.window import WindowHandler
+from bot.core.source import FrameSource
+from bot.core.capture import CaptureWorker
+from bot.core.dispatcher import InputDispatcher
+from bot.core.latency import LatencyProbe
+from bot.core.recorder import SessionRecorder
 from bot.core.scheduler import TitanScheduler
-from bot.core.imagesearch import image_search_area, click_image
+from bot.core.imagesearch import image_search_area, image_search_batch, click_image, get_executor
 from bot.core.imagecompare import compare_images
+from bot.core.templates import TemplateStore
+from bot.core.hints import LocationHints
+from bot.core.prefilter import Prefilter
+from bot.core.screens import ScreenClassifier
+from bot.core.scaling import (
+    BASE_WIDTH,
+    BASE_HEIGHT,
+    scale_configurations,
+    calibrate_scale,
+)
+from bot.core.frame import Frame
 from bot.core.exceptions import (
     GameStateException,
     StoppedException,
     PausedException,
+    FailSafeException,
 )
 from bot.core.utilities import (
     create_logger,
@@ -21,10 +39,8 @@ from bot.plugins.plugin import (
     PLUGINS,
 )
 
+from concurrent.futures import Future
 from itertools import cycle
-from pyautogui import FailSafeException
-
-from PIL import Image
 
 import datetime
 import numpy
@@ -59,6 +75,7 @@ class Bot(object):
         self.application_version = application_version
 
         self.files = {}           # Program Files.
+        self.templates = None     # Program Templates (Decoded Files).
         self.configurations = {}  # Global Program Configurations
         self.configuration = {}   # Local Bot Configurations.
         self.plugins = {}         # Local Bot Plugins.
@@ -121,6 +138,52 @@ class Bot(object):
         # screenshot is ever the same as the current one, the emulator has
         # most likely frozen.
         self.last_screenshot = None
+        # The frame cache stores the last full window capture, along with the window
+        # generation and time it was taken, read-only checks performed between two
+        # inputs can share a single capture this way.
+        self.frame = None
+        self.frame_generation = None
+        self.frame_timestamp = None
+        # Expired frames are never reused, the next capture is always taken after
+        # the frame was expired (retries expire the frame they just searched).
+        self.frame_expired = False
+        self.frame_cache_hits = 0
+        self.frame_cache_misses = 0
+        # Search results are memoized for the life of a single frame, the cache
+        # is cleared whenever a new frame is used by a search.
+        self.search_cache = {}
+        self.search_cache_frame = None
+        self.search_cache_hits = 0
+        # The capture worker is optional, and will grab frames in the
+        # background for us when it's enabled.
+        self.capture_worker = None
+        # The input dispatcher is optional, and will send inputs to the window
+        # on its own thread when it's enabled, in the order they're queued.
+        self.dispatcher = None
+        # The latency probe is optional, and will measure how long our window takes
+        # to react to input, our pauses can be scaled to this latency when enabled.
+        self.latency = None
+        # The recorder is optional, and will stream every new frame as well as
+        # any inputs sent to the window into a session archive when enabled.
+        self.recorder = None
+        # The plugin currently being executed, this is tracked so that
+        # recorded frames and inputs can be tied to their plugin.
+        self.plugin_active = None
+        # Location hints are optional, and will let searches try the last
+        # known location of a template before searching its full region.
+        self.hints = None
+        # The prefilter is optional, and will reject searches that can't possibly
+        # match before any template matching takes place.
+        self.prefilter = None
+        # The executor is optional, and is shared by every bot in this process,
+        # lists of images are matched in parallel when it's available.
+        self.executor = None
+        # The screen classifier is optional, and is only available once screen
+        # signatures have been generated from a labelled replay set.
+        self.classifier = None
+        # The scale of the emulator compared to our base resolution, every point,
+        # region and template is scaled by this value when it's not 1.0.
+        self.scale = 1.0
 
         self.logger, self.stream = create_logger(
             log_directory=LOCAL_DATA_LOGS_DIRECTORY,
@@ -135,15 +198,7 @@ class Bot(object):
         self.configure_schema()
         self.configure_plugins()
 
-        self.handle = WindowHandler()
-        self.window = self.handle.filter_first(
-            filter_title=self.window,
-        )
-        self.window.configure(
-            instance=self.instance,
-            get_settings_obj=self.get_settings_obj,
-            force_stop_func=self.force_stop_func,
-        )
+        self.configure_window()
 
         # Begin running the bot once all dependency/configuration/files/variables
         # have been handled and are ready to go.
@@ -159,6 +214,20 @@ class Bot(object):
                 self.files[file.name.split(".")[0]] = file.path
         self.logger.debug(self.files)
 
+        # Every image is also decoded up front into our template store,
+        # searches and clicks will read templates from memory only.
+        self.templates = TemplateStore()
+        self.templates.load_directory(
+            directory=BOT_DATA_IMAGES_DIRECTORY,
+        )
+        self.logger.info(
+            "Templates: %(count)s Loaded (%(size).2f MB) In %(time).3f Second(s)." % {
+                "count": len(self.templates),
+                "size": self.templates.nbytes / (1024 * 1024),
+                "time": self.templates.load_time,
+            }
+        )
+
     def configure_schema(self):
         """Configure the schema available and used by the bot.
         """
@@ -168,6 +237,226 @@ class Bot(object):
             self.configurations = json.loads(schema.read())
         self.logger.debug(self.configurations)
 
+    def configure_window(self):
+        """Configure the window (frame source) used by the bot.
+
+        A frame source instance may be passed along instead of a window title, this lets
+        sessions run against sources other than an emulator window (replays).
+        """
+        self.logger.info("Configuring window...")
+
+        if not isinstance(self.window, FrameSource):
+            # The win32 window functionality is only imported when an actual
+            # emulator window is being used by the session.
+            from bot.core.window import WindowHandler
+
+            self.handle = WindowHandler()
+            self.window = self.handle.filter_first(
+                filter_title=self.window,
+            )
+        self.window.configure(
+            instance=self.instance,
+            get_settings_obj=self.get_settings_obj,
+            force_stop_func=self.force_stop_func,
+        )
+        if hasattr(self.window, "geometry_max_age"):
+            self.window.geometry_max_age = self.configurations["global"]["capture"]["geometry_max_age"]
+
+        if self.configurations["global"]["capture"]["worker_enabled"]:
+            self.capture_worker = CaptureWorker(
+                source=self.window,
+                fps=self.configurations["global"]["capture"]["worker_fps"],
+                size=self.configurations["global"]["capture"]["worker_size"],
+            )
+            self.capture_worker.start()
+
+        if self.configurations["global"]["input"]["dispatcher_enabled"]:
+            self.dispatcher = InputDispatcher(
+                source=self.window,
+                rate=self.configurations["global"]["input"]["dispatcher_rate"],
+            )
+            self.dispatcher.start()
+
+        if self.configurations["global"]["latency"]["enabled"]:
+            self.latency = LatencyProbe(
+                size=self.configurations["global"]["latency"]["size"],
+                threshold=self.configurations["global"]["latency"]["threshold"],
+                reference=self.configurations["global"]["latency"]["reference"],
+                margin=self.configurations["global"]["latency"]["margin"],
+                floor=self.configurations["global"]["latency"]["floor"],
+            )
+
+        if self.configurations["global"]["search"]["pool_workers"]:
+            self.executor = get_executor(
+                workers=self.configurations["global"]["search"]["pool_workers"],
+            )
+
+        if self.configurations["global"]["search"]["prefilter_enabled"]:
+            self.prefilter = Prefilter(
+                bins=self.configurations["global"]["search"]["prefilter_bins"],
+                threshold=self.configurations["global"]["search"]["prefilter_threshold"],
+                shadow=self.configurations["global"]["search"]["prefilter_shadow"],
+                templates=self.templates,
+            )
+
+        if self.configurations["global"]["search"]["hints_enabled"]:
+            self.hints = LocationHints(
+                padding=self.configurations["global"]["search"]["hints_padding"],
+            )
+
+        if self.configurations["global"]["screens"]["enabled"] and os.path.exists(LOCAL_DATA_SCREENS_FILE):
+            self.classifier = ScreenClassifier.load(
+                path=LOCAL_DATA_SCREENS_FILE,
+                confidence=self.configurations["global"]["screens"]["confidence"],
+            )
+            self.logger.info(
+                "Screens: %(screens)s Loaded (%(signatures)s Signature(s))" % {
+                    "screens": len(self.classifier.screens),
+                    "signatures": len(self.classifier),
+                }
+            )
+
+        if self.get_settings_obj().record_sessions:
+            self.recorder = SessionRecorder(
+                directory=os.path.join(LOCAL_DATA_RECORDINGS_DIRECTORY, "%(instance_name)s-%(session)s" % {
+                    "instance_name": self.instance_name.replace(" ", "-").lower(),
+                    "session": self.session,
+                }),
+                keyframe_interval=self.configurations["global"]["recorder"]["keyframe_interval"],
+                compression=self.configurations["global"]["recorder"]["compression"],
+                size=self.configurations["global"]["recorder"]["queue_size"],
+            )
+            self.recorder.start()
+            self.window.input_listeners.append(self.record_input)
+
+    def configure_scale(self):
+        """Configure the scale used by the bot, this is only done when scaling is enabled.
+
+        An initial scale is taken from the window width, and then calibrated by searching for the
+        anchor template at scales around it, every point, region and template is scaled to match.
+        """
+        if not self.configurations["global"]["scale"]["enabled"]:
+            return
+
+        self.logger.info("Configuring scale...")
+
+        scale = self.window.width / BASE_WIDTH
+        # Our emulator always has the same aspect ratio, so the initial
+        # emulator size is estimated from the window width here.
+        self.window.emulator_width, self.window.emulator_height = (
+            self.window.width,
+            int(round(BASE_HEIGHT * scale)),
+        )
+        calibrated = calibrate_scale(
+            frame=self.snapshot(cache=False),
+            templates=self.templates,
+            anchor=self.files[self.configurations["global"]["scale"]["anchor"]],
+            scale=scale,
+            search_range=self.configurations["global"]["scale"]["search_range"],
+            steps=self.configurations["global"]["scale"]["search_steps"],
+            precision=self.configurations["global"]["scale"]["precision"],
+        )
+        if calibrated:
+            scale, score = calibrated
+            self.logger.info(
+                "Scale: %(scale).3f (Calibrated, Score: %(score).3f)" % {
+                    "scale": scale,
+                    "score": score,
+                }
+            )
+        else:
+            self.logger.info(
+                "Scale: %(scale).3f (Unable to find the anchor image, using the window width)" % {
+                    "scale": scale,
+                }
+            )
+        self.scale = round(scale, 3)
+        # The emulator size is taken from our calibrated scale, so that the
+        # window padding (and every region within it) matches the frame.
+        self.window.emulator_width, self.window.emulator_height = (
+            int(round(BASE_WIDTH * self.scale)),
+            int(round(BASE_HEIGHT * self.scale)),
+        )
+
+        if self.scale != 1.0:
+            self.configurations = scale_configurations(
+                configurations=self.configurations,
+                scale=self.scale,
+            )
+            self.templates.rescale(
+                scale=self.scale,
+            )
+            if self.hints:
+                self.hints.padding = self.configurations["global"]["search"]["hints_padding"]
+
+    def configure_latency(self):
+        """Configure the latency estimate used by the bot, this is only done when the latency probe is enabled.
+
+        Every probe clicks on the main screen, so enabling the probe adds "global.latency.startup_clicks"
+        clicks to the start of each session, probes are never made once the session is running.
+        """
+        if not self.latency:
+            return
+
+        self.logger.info("Configuring latency...")
+
+        for _ in range(self.configurations["global"]["latency"]["startup_clicks"]):
+            self.probe_latency()
+
+        if self.latency.estimate is None:
+            self.logger.info(
+                "Latency: Unable to measure the window latency, using the configured pauses"
+            )
+        else:
+            self.logger.info(
+                "Latency: %(latency).3f Second(s) (Pause Factor: %(factor).2f%(auto)s)" % {
+                    "latency": self.latency.estimate,
+                    "factor": self.latency.factor,
+                    "auto": "" if self.configurations["global"]["latency"]["auto_pauses"] else ", Disabled",
+                }
+            )
+
+    def probe_latency(self):
+        """Measure the latency of the current window once, by clicking on the main screen and waiting for a reaction.
+        """
+        point = self.configurations["points"]["main_screen"]["top_middle"]
+        radius = self.configurations["global"]["latency"]["radius"]
+
+        return self.latency.measure(
+            source=self.window,
+            click=lambda: self.click(
+                point=point,
+                offset=0,
+                pause=0.0,
+            ),
+            region=(
+                point[0] - radius,
+                point[1] - radius,
+                point[0] + radius,
+                point[1] + radius,
+            ),
+            timeout=self.configurations["global"]["latency"]["timeout"],
+            interval=self.configurations["global"]["latency"]["poll_interval"],
+        )
+
+    def _pause(self, pause):
+        """Retrieve the pause that should be used in place of the pause specified.
+
+        Pauses are scaled to our measured latency when auto pauses are enabled.
+        """
+        if pause and self.latency and self.configurations["global"]["latency"]["auto_pauses"]:
+            return self.latency.scale(pause=pause)
+        return pause
+
+    def record_input(self, event, parameters):
+        """Record an input sent to the window, this is used as an input listener while recording.
+        """
+        self.recorder.record_event(
+            event=event,
+            parameters=parameters,
+            plugin=self.plugin_active,
+        )
+
     def configure_additional(self):
         """Configure any additional variables or values that can be used throughout session runtime.
         """
@@ -302,7 +591,29 @@ class Bot(object):
                 "interval": plugin.interval,
             }
         )
-        self.schedule.every(interval=interval).seconds.do(job_func=plugin.execute).tag(plugin.name)
+        self.schedule.every(interval=interval).seconds.do(job_func=self.execute_plugin, plugin=plugin).tag(plugin.name)
+
+    def execute_plugin(self, plugin, force=False):
+        """Execute the given plugin, tracking it as the active plugin while it runs.
+        """
+        if isinstance(plugin, str):
+            plugin = self.plugins[plugin]
+
+        plugin_previous, self.plugin_active = (
+            self.plugin_active,
+            plugin.name,
+        )
+        if self.recorder:
+            self.recorder.record_event(
+                event="plugin",
+                plugin=plugin.name,
+            )
+        try:
+            return plugin.execute(
+                force=force,
+            )
+        finally:
+            self.plugin_active = plugin_previous
 
     def cancel_scheduled_plugin(self, tags):
         """
@@ -329,7 +640,8 @@ class Bot(object):
                 self.run_checks()
                 # Execute the given plugin with our force flag
                 # properly passed along.
-                plugin.execute(
+                self.execute_plugin(
+                    plugin=plugin,
                     force=plugin.force_on_start,
                 )
 
@@ -352,35 +664,137 @@ class Bot(object):
         count += 1
 
         if count <= timeout:
+            # Every retry is made against a new capture, whatever we're
+            # waiting on can only appear in frames taken after this one.
+            self.invalidate()
             return count
 
         # Raising a timeout error if the specified count is over
         # our timeout after incrementing it by one.
         raise TimeoutError()
 
+    def invalidate(
+        self,
+    ):
+        """Invalidate the cached frame, the next capture will always be a new one.
+
+        Captures are taken after this call, frames grabbed earlier by the capture worker are never used,
+        and every search memoized on the old frame is dropped with it.
+        """
+        self.frame = None
+        self.frame_timestamp = None
+        self.frame_expired = True
+
+        self.search_cache = {}
+        self.search_cache_frame = None
+
+    def frame_cached(
+        self,
+        timestamp=None,
+    ):
+        """Determine whether or not the cached frame is still valid.
+
+        No inputs may have been sent to the window since it was taken, and it may
+        not be older than the configured max age (in milliseconds).
+        """
+        return (
+            self.frame_generation == self.window.generation
+            and self.frame_timestamp is not None
+            and (timestamp or time.perf_counter()) - self.frame_timestamp <= (
+                self.configurations["global"]["snapshot"]["frame_cache_max_age"] / 1000
+            )
+        )
+
+    def capture(
+        self,
+        region=None,
+        cache=True,
+    ):
+        """Retrieve a capture of the current windows screen, or a region within it.
+
+        The cached frame is used if no inputs have been sent to the window since it
+        was taken, and it's not older than the configured max age (in milliseconds).
+        """
+        timestamp = time.perf_counter()
+        max_age = self.configurations["global"]["snapshot"]["frame_cache_max_age"] / 1000
+
+        if self.frame_expired:
+            cache = False
+            self.frame_expired = False
+
+        if cache and self.frame_cached(timestamp=timestamp):
+            self.frame_cache_hits += 1
+            refresh = False
+        else:
+            self.frame_cache_misses += 1
+            refresh = True
+
+            self.frame = None
+            self.frame_generation = self.window.generation
+            self.frame_timestamp = timestamp
+
+            if self.capture_worker:
+                # Using the newest frame from our capture worker if one was captured
+                # since the last input, uncached captures must begin after this call.
+                latest = self.capture_worker.latest(
+                    generation=self.frame_generation,
+                    after=timestamp - max_age if cache else timestamp,
+                    timeout=self.configurations["global"]["capture"]["worker_timeout"],
+                )
+                if latest:
+                    self.frame_timestamp, self.frame = latest
+
+            if self.recorder:
+                # Recorded sessions always use full frames, so that every
+                # new frame can be streamed into our recording.
+                if self.frame is None:
+                    self.frame = self.window.screenshot()
+                self.recorder.record_frame(
+                    frame=self.frame,
+                    plugin=self.plugin_active,
+                )
+
+        if region:
+            if self.frame is not None:
+                return self.frame.crop(
+                    box=region,
+                )
+            # No full frame is available yet, we'll only copy our region
+            # out of the window capture, re-reading the last one if it's
+            # still valid.
+            return self.window.screenshot(
+                region=region,
+                refresh=refresh,
+            )
+        if self.frame is None:
+            self.frame = self.window.screenshot(
+                refresh=refresh,
+            )
+        return self.frame
+
     def snapshot(
         self,
         region=None,
         scale=None,
-        pause=0.0
+        pause=0.0,
+        cache=True,
     ):
         """Take a snapshot of the current windows screen.
 
         This helper utility ensures that our local variable is updated, and that
         any required downsizing is also applied everywhere.
         """
-        snapshot = self.window.screenshot(
+        snapshot = self.capture(
             region=region,
+            cache=cache,
         )
-
         # Scaling the screenshot by the specified amounts if specified.
         # This may prove useful if we need to take many snapshots in
         # quick succession.
         if scale:
-            snapshot.thumbnail((
-                snapshot.width * scale,
-                snapshot.height * scale,
-            ))
+            snapshot = snapshot.resize(
+                scale=scale,
+            )
         if pause:
             time.sleep(
                 pause
@@ -397,8 +811,8 @@ class Bot(object):
     ):
         """Attempt to process a specified image or screenshot region.
         """
-        img = image or self.snapshot(region=region)
-        img = numpy.array(img)
+        img = image if image is not None else self.snapshot(region=region)
+        img = numpy.asarray(img)
 
         # Scale and desaturate the image, this improves some of the
         # optical character recognition functionality.
@@ -444,10 +858,65 @@ class Bot(object):
             img = cv2.bitwise_not(
                 src=img,
             )
-        return Image.fromarray(
-            obj=img,
+        return Frame(
+            array=img,
         )
 
+    def screen(
+        self,
+        im=None,
+    ):
+        """Classify the current game screen, returning a tuple containing the (screen, confidence).
+
+        The screen is None if it could not be classified, or if no classifier is available.
+        """
+        if not self.classifier:
+            return None, 0.0
+
+        screen, confidence = self.classifier.classify(
+            frame=im if im is not None else self.snapshot(),
+        )
+        self.logger.debug(
+            "Screen: %(screen)s (Confidence: %(confidence).3f)" % {
+                "screen": screen,
+                "confidence": confidence,
+            }
+        )
+        return screen, confidence
+
+    def search_kwargs(
+        self,
+        region=None,
+        precision=0.8,
+        im=None,
+    ):
+        """Generate the keyword arguments used by our image search functions.
+
+        Screen queries use these to search a region of their own frame with the same
+        templates, hints and prefilter as our own searches.
+        """
+        search = self.configurations["global"]["search"]
+
+        return {
+            "x1": region[0] if region else self.window.x,
+            "y1": region[1] if region else self.window.y,
+            "x2": region[2] if region else self.window.width,
+            "y2": region[3] if region else self.window.height,
+            "precision": precision,
+            "im": im if im is not None else self.snapshot(region=region),
+            "templates": self.templates,
+            # The pyramid (coarse to fine) matcher is optional, and is
+            # only used when it's been enabled.
+            "pyramid": {
+                "scale": search["pyramid_scale"],
+                "candidates": search["pyramid_candidates"],
+                "margin": search["pyramid_margin"],
+                "min_size": search["pyramid_min_size"],
+            } if search["pyramid_enabled"] else None,
+            "hints": self.hints,
+            "prefilter": self.prefilter,
+        }
+
     def search(
         self,
         image,
@@ -465,40 +934,54 @@ class Bot(object):
         0: True/False  (Image found).
         1: [X, Y]      (Image position).
         2: image.png   (Image name).
+
+        Results are memoized while the same frame is being searched, repeating an identical search
+        before any inputs are sent (and before the frame expires) returns the previous result.
         """
-        search_kwargs = {
-            "x1": region[0] if region else self.window.x,
-            "y1": region[1] if region else self.window.y,
-            "x2": region[2] if region else self.window.width,
-            "y2": region[3] if region else self.window.height,
-            "precision": precision,
-            "im": im if region else self.snapshot() if not im else im,
-        }
+        key = None
+
+        if im is None and self.configurations["global"]["search"]["memoize_enabled"]:
+            key = (
+                tuple(image) if isinstance(image, list) else image,
+                tuple(region) if region else None,
+                precision,
+            )
+            if (
+                self.frame_cached()
+                and self.search_cache_frame == (self.frame_generation, self.frame_timestamp)
+                and key in self.search_cache
+            ):
+                self.search_cache_hits += 1
+                return self.search_cache[key]
+
+        search_kwargs = self.search_kwargs(
+            region=region,
+            precision=precision,
+            im=im,
+        )
 
         pos = [-1, -1]
         img = image
 
         if isinstance(image, list):
-            for i in image:
-                self.logger.debug(
-                    "Searching for image: \"%(image)s\"..." % {
-                        "image": i,
-                    }
-                )
-                img = i
-                pos = image_search_area(
-                    window=self.window,
-                    image=img,
-                    **search_kwargs
-                )
-                # If we're looping over a list of images, we need to add a slight
-                # interval in between searches, otherwise our emulator may experience
-                # some odd flashing issues. This is also a performance boost to prevent
-                # quick subsequent calls.
-                time.sleep(self.configurations["global"]["search"]["search_list_interval"])
-
-                if pos[0] != -1:
-                    break
+            self.logger.debug(
+                "Searching for images: \"%(images)s\"..." % {
+                    "images": ", ".join(str(i) for i in image),
+                }
+            )
+            # Every image in our list is matched against the same frame, searching
+            # stops at the first image found.
+            matches = image_search_batch(
+                window=self.window,
+                images=image,
+                executor=self.executor,
+                first=True,
+                **search_kwargs
+            )
+            if matches:
+                img, score, pos = matches[0]
+            elif image:
+                img = image[-1]
         else:
             self.logger.debug(
                 "Searching for image: \"%(image)s\"..." % {
@@ -527,12 +1010,84 @@ class Bot(object):
                     region[0] + pos[0],
                     region[1] + pos[1],
                 )
+        if key is not None:
+            # Our frame identity is the generation and timestamp of the frame
+            # that was just searched, a new frame clears any old results.
+            frame = (self.frame_generation, self.frame_timestamp)
+
+            if self.search_cache_frame != frame:
+                self.search_cache = {}
+                self.search_cache_frame = frame
+            self.search_cache[key] = (
+                found,
+                pos,
+                img,
+            )
         return (
             found,
             pos,
             img,
         )
 
+    def search_batch(
+        self,
+        images,
+        region=None,
+        precision=0.8,
+        im=None,
+        first=False,
+    ):
+        """Search for each of the specified images on the current window, using a single frame.
+
+        A list is always returned here, containing a tuple for every image found, ranked
+        by score (best match first). Each tuple contains the following information:
+
+        0: image.png   (Image name).
+        1: 0.0 - 1.0   (Match score).
+        2: [X, Y]      (Image position).
+        """
+        self.logger.debug(
+            "Searching for images: \"%(images)s\"..." % {
+                "images": ", ".join(str(i) for i in images),
+            }
+        )
+        matches = image_search_batch(
+            window=self.window,
+            images=images,
+            executor=self.executor,
+            first=first,
+            **self.search_kwargs(
+                region=region,
+                precision=precision,
+                im=im,
+            )
+        )
+        if region:
+            # Positions are converted back to our proper window
+            # top left point when a region is specified.
+            matches = [
+                (img, score, (region[0] + pos[0], region[1] + pos[1])) for img, score, pos in matches
+            ]
+        return matches
+
+    def query(
+        self,
+        query,
+        im=None,
+    ):
+        """Evaluate the specified screen query against the current window, using a single frame.
+        """
+        result = query.evaluate(
+            bot=self,
+            im=im,
+        )
+        self.logger.debug(
+            "Query: %(result)s" % {
+                "result": result,
+            }
+        )
+        return result
+
     def duplicates(
         self,
         image,
@@ -549,9 +1104,12 @@ class Bot(object):
             # Force image, false return. The second iteration will now
             # contain our proper image and valid dupe status.
             return image, False
+        # The latest snapshot always bypasses the frame cache, otherwise
+        # an unchanged cached frame would always be a duplicate.
         latest = self.snapshot(
             region=region,
             pause=pause_before_check,
+            cache=False,
         )
         return latest, compare_images(
             image_one=image,
@@ -566,15 +1124,9 @@ class Bot(object):
     ):
         """Check that a specific point is currently a certain color.
         """
-        try:
-            return self.snapshot().getpixel(
-                xy=tuple(point),
-            ) == tuple(color)
-        except IndexError:
-            # image index is out of range.
-            # possible when snapshot and tuple contain information
-            # that conflicts.
-            return False
+        return bool(self.probe(
+            probes=[(point, [(value, value) for value in color])],
+        )[0])
 
     def point_is_color_range(
         self,
@@ -583,22 +1135,36 @@ class Bot(object):
     ):
         """Check that a specific point is currently within a color range.
         """
-        try:
-            pixel = self.snapshot().getpixel(
-                xy=tuple(point),
-            )
-        except IndexError:
-            # image index is out of range.
-            # possible when snapshot and tuple contain information
-            # that conflicts.
-            return False
-        # Additional checks here to determine that pixel falls within
-        # the range specified...
-        return (
-            color_range[0][0] <= pixel[0] <= color_range[0][1]
-            and color_range[1][0] <= pixel[1] <= color_range[1][1]
-            and color_range[2][0] <= pixel[2] <= color_range[2][1]
+        return bool(self.probe(
+            probes=[(point, color_range)],
+        )[0])
+
+    def probe(
+        self,
+        probes,
+        im=None,
+    ):
+        """Check that each specified point is currently within its color range, using a single frame.
+
+        Probes should be a list of (point, color_range) tuples, a numpy array of booleans is returned,
+        containing one value for each probe. Points outside of the frame are never within their range.
+        """
+        frame = numpy.asarray(im if im is not None else self.snapshot())
+
+        points = numpy.array([probe[0] for probe in probes], dtype=int).reshape(-1, 2)
+        ranges = numpy.array([probe[1] for probe in probes], dtype=int).reshape(-1, 3, 2)
+
+        # Points outside of our frame are read from the origin instead,
+        # and are then marked as invalid (outside of their range).
+        valid = (
+            (0 <= points[:, 0]) & (points[:, 0] < frame.shape[1])
+            & (0 <= points[:, 1]) & (points[:, 1] < frame.shape[0])
         )
+        pixels = frame[points[:, 1] * valid, points[:, 0] * valid, :3]
+
+        return valid & (
+            (ranges[:, :, 0] <= pixels) & (pixels <= ranges[:, :, 1])
+        ).all(axis=1)
 
     @staticmethod
     def point_is_region(
@@ -612,8 +1178,53 @@ class Bot(object):
             and region[1] <= point[1] <= region[3]
         )
 
-    @staticmethod
+    def _dispatch(
+        self,
+        event,
+        window=None,
+        wait=True,
+        **parameters
+    ):
+        """Send an input to the window specified (or the current window).
+
+        Inputs for the current window are queued on our dispatcher when it's enabled, a completion handle is
+        returned for the input, which has already completed when waiting or when sending inputs directly.
+        """
+        window = window or self.window
+
+        if self.dispatcher and window is self.window:
+            # Our checks are made here, on our own thread, any input that failed on the dispatcher
+            # (stopped, failsafe, etc) is then raised before queueing anything else.
+            window._failsafe()
+            window._force_stop()
+
+            if self.dispatcher.exception:
+                raise self.dispatcher.exception
+
+            handle = self.dispatcher.submit(event, **parameters)
+
+            if wait:
+                handle.result()
+            return handle
+
+        # Sending inputs directly, any queued inputs are always
+        # sent first so that our inputs are never out of order.
+        self.flush()
+
+        handle = Future()
+        getattr(window, event)(**parameters)
+        handle.set_result(None)
+
+        return handle
+
+    def flush(self):
+        """Wait until every queued input has been sent to the current window.
+        """
+        if self.dispatcher:
+            self.dispatcher.flush()
+
     def _click(
+        self,
         point,
         window,
         clicks=1,
@@ -622,13 +1233,15 @@ class Bot(object):
         offset=5,
         pause=0.001,
     ):
-        window.click(
+        self._dispatch(
+            "click",
+            window=window,
             point=point,
             clicks=clicks,
             interval=interval,
             button=button,
             offset=offset,
-            pause=pause,
+            pause=self._pause(pause=pause),
         )
 
     def click(
@@ -688,6 +1301,24 @@ class Bot(object):
                         timeout=timeout,
                     )
 
+    def taps(
+        self,
+        points,
+        window=None,
+        button="left",
+    ):
+        """Perform a sequence of taps on the current window, the points should already include any offsets.
+
+        Taps are queued without waiting for them to be sent, the completion handle for the taps is returned.
+        """
+        return self._dispatch(
+            "taps",
+            window=window,
+            wait=False,
+            points=points,
+            button=button,
+        )
+
     def _find_and_click_image(
         self,
         image,
@@ -717,7 +1348,7 @@ class Bot(object):
             )
         else:
             time.sleep(
-                pause_not_found
+                self._pause(pause=pause_not_found)
             )
         # Always returning whether or not we found and most likely,
         # clicked on the image specified.
@@ -802,12 +1433,19 @@ class Bot(object):
         end,
         button="left",
         pause=0.0,
+        duration=None,
+        steps=None,
+        easing=None,
     ):
-        self.window.drag(
+        self._dispatch(
+            "drag",
             start=start,
             end=end,
             button=button,
-            pause=pause,
+            pause=self._pause(pause=pause),
+            duration=duration,
+            steps=steps,
+            easing=easing,
         )
 
     def drag(
@@ -816,17 +1454,26 @@ class Bot(object):
         end,
         button="left",
         pause=0.0,
+        duration=None,
+        steps=None,
+        easing=None,
         timeout=None,
         timeout_search_while_not=True,
         timeout_search_kwargs=None,
     ):
         """Perform a drag on the current window.
+
+        The duration, steps and easing of the drag default to our configured values, drags move one
+        pixel at a time (vertically) when no duration is configured.
         """
         _drag_kwargs = {
             "start": start,
             "end": end,
             "button": button,
             "pause": pause,
+            "duration": duration if duration is not None else self.configurations["global"]["input"]["drag_duration"],
+            "steps": steps or self.configurations["global"]["input"]["drag_steps"],
+            "easing": easing or self.configurations["global"]["input"]["drag_easing"],
         }
         if not timeout:
             self._drag(
@@ -873,6 +1520,10 @@ class Bot(object):
     ):
         """Perform a click on a particular image on the current window.
         """
+        # Image clicks are sent directly, after
+        # any queued inputs have been sent.
+        self.flush()
+
         click_image(
             window=self.window,
             image=image,
@@ -881,7 +1532,8 @@ class Bot(object):
             clicks=clicks,
             interval=interval,
             offset=offset,
-            pause=pause,
+            pause=self._pause(pause=pause),
+            templates=self.templates,
         )
 
     def collapse(self):
@@ -1045,28 +1697,34 @@ class Bot(object):
                 }
             )
 
-        # Always performing a quick find and click on an open prompt
-        # page exit icon (large exit).
-        while True:
-            if self.find_and_click_image(
-                image=self.files["large_exit"],
-                region=self.configurations["regions"]["travel"]["exit_area"],
-                precision=self.configurations["parameters"]["travel"]["exit_precision"],
-                pause=self.configurations["parameters"]["travel"]["exit_pause"],
-            ):
-                continue
-            break
+        # If the tab is already open, we can skip right
+        # to our collapse and scroll functionality.
+        screen, confidence = self.screen()
+
+        if screen != tab:
+            # Always performing a quick find and click on an open prompt
+            # page exit icon (large exit).
+            while True:
+                if self.find_and_click_image(
+                    image=self.files["large_exit"],
+                    region=self.configurations["regions"]["travel"]["exit_area"],
+                    precision=self.configurations["parameters"]["travel"]["exit_precision"],
+                    pause=self.configurations["parameters"]["travel"]["exit_pause"],
+                ):
+                    continue
+                break
         try:
-            self.click(
-                point=self.configurations["points"]["travel"]["tabs"][tab],
-                pause=self.configurations["parameters"]["travel"]["click_pause"],
-                timeout=self.configurations["parameters"]["travel"]["timeout_click"],
-                timeout_search_kwargs={
-                    "image": image,
-                    "region": self.configurations["regions"]["travel"]["search_area"],
-                    "precision": self.configurations["parameters"]["travel"]["precision"],
-                },
-            )
+            if screen != tab:
+                self.click(
+                    point=self.configurations["points"]["travel"]["tabs"][tab],
+                    pause=self.configurations["parameters"]["travel"]["click_pause"],
+                    timeout=self.configurations["parameters"]["travel"]["timeout_click"],
+                    timeout_search_kwargs={
+                        "image": image,
+                        "region": self.configurations["regions"]["travel"]["search_area"],
+                        "precision": self.configurations["parameters"]["travel"]["precision"],
+                    },
+                )
 
             # Tab is open at this point. Perform the collapse, un-collapse functionality
             # before attempting to scroll to the top or bottom of a panel.
@@ -1273,6 +1931,18 @@ class Bot(object):
                     count=timeout_travel_to_main_screen_cnt,
                     timeout=timeout_travel_to_main_screen_max
                 )
+                # The current screen is classified first, the main screen
+                # or an open tab can be handled without any searching.
+                screen, confidence = self.screen()
+
+                if screen == "main":
+                    break
+                if screen in self.configurations["points"]["travel"]["tabs"]:
+                    self.click(
+                        point=self.configurations["points"]["travel"]["tabs"][screen],
+                        pause=self.configurations["parameters"]["travel"]["click_pause"],
+                    )
+                    continue
                 found, position, image = self.search(
                     image=[file for file in self.image_tabs.keys()],
                     region=self.configurations["regions"]["travel"]["search_area"],
@@ -1326,7 +1996,7 @@ class Bot(object):
         # Check for explicit prestige force...
         if self.force_prestige_func(instance=self.instance):
             self.force_prestige_func(instance=self.instance, _set=True,)
-            self.plugins["prestige"].execute()
+            self.execute_plugin(plugin="prestige")
         if self.force_stop_func(instance=self.instance):
             self.force_stop_func(instance=self.instance, _set=True)
             # Just raise a stopped exception if we
@@ -1385,6 +2055,8 @@ class Bot(object):
         )
 
         try:
+            self.configure_scale()
+            self.configure_latency()
             self.configure_additional()
             # Any functions that should be ran once on startup
             # can be handled at this point.
@@ -1432,6 +2104,16 @@ class Bot(object):
                 exc_info=exc,
             )
         finally:
+            # Any capture resources held by our window are released
+            # once the session is over, regardless of how it ended.
+            if self.dispatcher:
+                self.dispatcher.stop()
+                self.dispatcher = None
+            if self.capture_worker:
+                self.capture_worker.stop()
+            if self.recorder:
+                self.recorder.stop()
+            self.window.release()
             # Log some additional information now that our session is ending. This
             # information should be displayed regardless of the reason that caused
             # our termination of this instance.
@@ -1444,4 +2126,52 @@ class Bot(object):
             self.logger.info("Session: %(session)s" % {
                 "session": self.session,
             })
+            self.logger.info("Frame Cache: %(hits)s Hit(s), %(misses)s Miss(es)" % {
+                "hits": self.frame_cache_hits,
+                "misses": self.frame_cache_misses,
+            })
+            self.logger.info("Search Cache: %(hits)s Hit(s)" % {
+                "hits": self.search_cache_hits,
+            })
+            self.logger.info("Screenshot Lock Wait: %(wait).3f Second(s)" % {
+                "wait": self.window.screenshot_lock_wait,
+            })
+            if self.hints:
+                self.logger.info("Location Hints: %(hits)s Hit(s), %(misses)s Miss(es), %(saved).3f Second(s) Saved" % {
+                    "hits": self.hints.hits,
+                    "misses": self.hints.misses,
+                    "saved": self.hints.saved,
+                })
+                for name, stats in sorted(self.hints.stats.items(), key=lambda item: item[1]["saved"], reverse=True):
+                    self.logger.debug("Location Hints: %(name)s: %(hits)s Hit(s), %(misses)s Miss(es), %(saved).3f Second(s) Saved" % {
+                        "name": name,
+                        "hits": stats["hits"],
+                        "misses": stats["misses"],
+                        "saved": stats["saved"],
+                    })
+            if self.prefilter:
+                self.logger.info("Prefilter: %(checks)s Check(s), %(rejected)s Rejected (%(rate).2f%%), %(false)s False Rejection(s)%(shadow)s" % {
+                    "checks": self.prefilter.checks,
+                    "rejected": self.prefilter.rejected,
+                    "rate": self.prefilter.rejection_rate * 100,
+                    "false": sum(self.prefilter.false_rejections.values()),
+                    "shadow": " (Shadow)" if self.prefilter.shadow else "",
+                })
+                for name, count in self.prefilter.false_rejections.items():
+                    self.logger.info("Prefilter: %(name)s: %(count)s False Rejection(s)" % {
+                        "name": name,
+                        "count": count,
+                    })
+            if self.latency and self.latency.estimate is not None:
+                self.logger.info("Latency: %(latency).3f Second(s), %(samples)s Sample(s), %(timeouts)s Timeout(s)" % {
+                    "latency": self.latency.estimate,
+                    "samples": len(self.latency.samples),
+                    "timeouts": self.latency.timeouts,
+                })
+            if self.recorder:
+                self.logger.info("Recording: %(directory)s (%(frames)s Frame(s), %(dropped)s Dropped)" % {
+                    "directory": self.recorder.directory,
+                    "frames": self.recorder.frames,
+                    "dropped": self.recorder.dropped,
+                })
             self.logger.info("===================================================================================")
@@ -0,0 +1,97 @@
+from collections import deque
+from threading import (
+    Thread,
+    Condition,
+    Event,
+)
+
+import time
+
+
+class CaptureWorker(Thread):
+    """
+    Capture workers continuously grab frames from a frame source at a configured fps, storing the most recent
+    frames in a small ring buffer, this lets captures overlap with template matching and input dispatch.
+    """
+    def __init__(
+        self,
+        source,
+        fps=20,
+        size=3,
+    ):
+        """
+        Initialize a new capture worker for the specified source.
+        """
+        super().__init__(daemon=True)
+
+        self.source = source
+        self.interval = 1 / fps
+        # Each frame is stored as a tuple containing the (timestamp, generation, frame),
+        # the timestamp and generation are taken before the capture begins.
+        self.frames = deque(maxlen=size)
+        self.condition = Condition()
+        self.stopped = Event()
+
+        self.exception = None
+
+    def run(self):
+        """
+        Begin capturing frames until the worker is stopped.
+        """
+        try:
+            while not self.stopped.is_set():
+                timestamp, generation = (
+                    time.perf_counter(),
+                    self.source.generation,
+                )
+                frame = self.source.screenshot()
+
+                with self.condition:
+                    self.frames.append((
+                        timestamp,
+                        generation,
+                        frame,
+                    ))
+                    self.condition.notify_all()
+
+                # Only sleeping for the remainder of our interval, so that
+                # capturing itself is included in our configured fps.
+                self.stopped.wait(timeout=max(self.interval - (time.perf_counter() - timestamp), 0))
+        except Exception as exc:
+            # Any exceptions are stored and the worker stops, sessions will
+            # just fall back to capturing inline from this point on.
+            self.exception = exc
+
+            with self.condition:
+                self.condition.notify_all()
+
+    def latest(self, generation, after=None, timeout=0.25):
+        """
+        Retrieve the newest (timestamp, frame) captured during the specified generation, and after the
+        timestamp specified (if any), waiting upto the timeout for one to become available.
+
+        None is returned if no valid frame is available in time.
+        """
+        deadline = time.perf_counter() + timeout
+
+        with self.condition:
+            while True:
+                if self.frames:
+                    timestamp, frame_generation, frame = self.frames[-1]
+
+                    if frame_generation == generation and (after is None or timestamp >= after):
+                        return timestamp, frame
+                remaining = deadline - time.perf_counter()
+
+                if remaining <= 0 or self.exception or not self.is_alive():
+                    return None
+                self.condition.wait(timeout=remaining)
+
+    def stop(self):
+        """
+        Stop the capture worker, waiting for any in progress capture to finish.
+        """
+        self.stopped.set()
+
+        if self.is_alive():
+            self.join()
@@ -0,0 +1,165 @@
+from concurrent.futures import Future
+from threading import (
+    Thread,
+    Event,
+)
+
+import numpy as np
+import queue
+import time
+
+
+class InputDispatcher(Thread):
+    """
+    Input dispatchers send every input (clicks, taps, drags) to a frame source on their own thread, inputs are queued
+    in order and a completion handle (future) is returned for each one, this lets the bot carry on analyzing frames
+    while a batch of inputs is still being sent.
+
+    An events per second ceiling can be configured, inputs are throttled so that they never exceed it.
+
+    Failsafe and force stop checks are never made on the dispatcher thread, they should be made by the thread
+    queueing inputs, before they're queued.
+    """
+    # Large batches of taps are split into chunks worth this many seconds
+    # of events, so that throttling remains smooth within a single batch.
+    CHUNK_DURATION = 0.01
+
+    def __init__(
+        self,
+        source,
+        rate=0,
+    ):
+        """
+        Initialize a new input dispatcher for the specified source, a rate of zero disables throttling.
+        """
+        super().__init__(daemon=True)
+
+        self.source = source
+        self.rate = rate
+        # Each queued input is stored as a tuple containing the (future, event, parameters),
+        # the event being the name of the source method that sends the input.
+        self.inputs = queue.Queue()
+        self.stopped = Event()
+        # The earliest time the next event may be sent, when throttling.
+        self._available = 0.0
+
+        self.events = 0
+        self.exception = None
+
+        self.source.dispatcher = self
+
+    def submit(self, event, **parameters):
+        """
+        Queue an input to be sent to the source, returning its completion handle.
+        """
+        if self.stopped.is_set():
+            raise RuntimeError("Inputs can not be queued once the dispatcher has been stopped.")
+
+        future = Future()
+        self.inputs.put((
+            future,
+            event,
+            parameters,
+        ))
+        return future
+
+    def flush(self):
+        """
+        Wait until every queued input has been sent to the source.
+
+        Any exception raised while sending inputs (stopped, failsafe, etc) is raised here.
+        """
+        self.inputs.join()
+
+        if self.exception:
+            raise self.exception
+
+    def _throttle(self, events):
+        """
+        Wait until the specified number of events can be sent without exceeding our rate.
+        """
+        if not self.rate:
+            return
+
+        now = time.perf_counter()
+
+        if self._available > now:
+            time.sleep(self._available - now)
+        self._available = max(self._available, now) + events / self.rate
+
+    def _dispatch(self, event, parameters):
+        """
+        Send a single queued input to the source.
+        """
+        if event == "taps":
+            points = np.asarray(parameters["points"]).reshape(-1, 2)
+            chunk = max(int(self.rate * self.CHUNK_DURATION), 1) if self.rate else len(points)
+
+            for index in range(0, len(points), chunk):
+                self._throttle(events=len(points[index:index + chunk]))
+                self.source.taps(**{**parameters, "points": points[index:index + chunk]})
+            self.events += len(points)
+        else:
+            events = parameters.get("clicks", 1)
+
+            self._throttle(events=events)
+            getattr(self.source, event)(**parameters)
+            self.events += events
+
+    def run(self):
+        """
+        Begin sending queued inputs until the dispatcher is stopped.
+        """
+        while not self.stopped.is_set():
+            command = self.inputs.get()
+
+            try:
+                if command is None:
+                    continue
+
+                future, event, parameters = command
+
+                if self.stopped.is_set():
+                    # Inputs are never sent once we've been stopped.
+                    future.cancel()
+                    continue
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if self.exception:
+                    # Once an input has failed, every input queued after it fails
+                    # the same way, nothing is sent out of order this way.
+                    future.set_exception(self.exception)
+                    continue
+                try:
+                    self._dispatch(event=event, parameters=parameters)
+                except Exception as exc:
+                    self.exception = exc
+                    future.set_exception(exc)
+                else:
+                    future.set_result(None)
+            finally:
+                self.inputs.task_done()
+
+    def stop(self):
+        """
+        Stop the input dispatcher, waiting for any in progress input to finish.
+
+        Inputs still queued once the dispatcher is stopped are never sent, their handles are cancelled.
+        """
+        self.stopped.set()
+        self.inputs.put(None)
+
+        if self.is_alive():
+            self.join()
+
+        while True:
+            try:
+                command = self.inputs.get_nowait()
+            except queue.Empty:
+                break
+            if command is not None:
+                command[0].cancel()
+            self.inputs.task_done()
+
+        if self.source.dispatcher is self:
+            self.source.dispatcher = None
@@ -12,3 +12,7 @@ class StoppedException(Exception):
 
 class PausedException(Exception):
     pass
+
+
+class FailSafeException(Exception):
+    pass
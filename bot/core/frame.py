@@ -0,0 +1,139 @@
+from PIL import Image
+
+import numpy as np
+import cv2
+
+
+class Frame(object):
+    """
+    Frame objects encapsulate a single captured (RGB) ndarray, handing out zero-copy region views and a lazily
+    computed grayscale version that is shared between every search performed against the frame.
+    """
+    def __init__(
+        self,
+        array,
+        parent=None,
+        box=None,
+    ):
+        """
+        Initialize a new frame with the specified array, frames cropped from another frame also
+        store their parent and box, so that grayscale conversion only ever happens once.
+        """
+        self.array = array
+        self.parent = parent
+        self.box = box
+
+        self._gray = None
+
+    @classmethod
+    def from_buffer(cls, buffer, width, height):
+        """
+        Generate a new frame from a raw (BGRX) buffer of the specified size.
+        """
+        array = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 4)
+        # Dropping our padding channel and reordering to RGB, this
+        # is the only copy made while creating our frame.
+        return cls(array=np.ascontiguousarray(array[:, :, 2::-1]))
+
+    @property
+    def width(self):
+        """
+        Retrieve the width of the frame.
+        """
+        return self.array.shape[1]
+
+    @property
+    def height(self):
+        """
+        Retrieve the height of the frame.
+        """
+        return self.array.shape[0]
+
+    @property
+    def size(self):
+        """
+        Retrieve the (width, height) of the frame.
+        """
+        return self.width, self.height
+
+    @property
+    def gray(self):
+        """
+        Retrieve the grayscale version of the frame, converting (and caching) it on first access.
+        """
+        if self._gray is None:
+            if self.parent is not None:
+                # Region views always re-use our parent's grayscale
+                # frame, converting the full frame at most once.
+                self._gray = self.parent.gray[self.box[1]:self.box[3], self.box[0]:self.box[2]]
+            elif self.array.ndim == 2:
+                self._gray = self.array
+            else:
+                # Our frames are RGB while the conversion used is BGR, this matches the
+                # conversion that every configured search precision was tuned against.
+                self._gray = cv2.cvtColor(self.array, cv2.COLOR_BGR2GRAY)
+        return self._gray
+
+    @property
+    def image(self):
+        """
+        Retrieve a PIL image of the frame, this is only generated on demand (debugging, saving, etc).
+        """
+        return Image.fromarray(self.array)
+
+    def crop(self, box):
+        """
+        Retrieve a zero-copy view of the specified box (x1, y1, x2, y2) within the frame.
+
+        Boxes that fall (partially) outside of the frame are zero padded, the same way PIL crops are, so the
+        origin of the frame returned is always the origin of the box, padded frames are a copy.
+        """
+        clamped = (
+            max(box[0], 0),
+            max(box[1], 0),
+            min(box[2], self.width),
+            min(box[3], self.height),
+        )
+        if tuple(box) == clamped:
+            return Frame(
+                array=self.array[box[1]:box[3], box[0]:box[2]],
+                parent=self,
+                box=clamped,
+            )
+
+        array = np.zeros((max(box[3] - box[1], 0), max(box[2] - box[0], 0)) + self.array.shape[2:], dtype=self.array.dtype)
+
+        if clamped[0] < clamped[2] and clamped[1] < clamped[3]:
+            array[
+                clamped[1] - box[1]:clamped[3] - box[1],
+                clamped[0] - box[0]:clamped[2] - box[0],
+            ] = self.array[clamped[1]:clamped[3], clamped[0]:clamped[2]]
+
+        return Frame(array=array)
+
+    def resize(self, scale):
+        """
+        Retrieve a new frame resized by the specified scale.
+        """
+        return Frame(
+            array=cv2.resize(
+                src=self.array,
+                dsize=None,
+                fx=scale,
+                fy=scale,
+                interpolation=cv2.INTER_AREA,
+            ),
+        )
+
+    def getpixel(self, xy):
+        """
+        Retrieve the pixel value at the specified (x, y) point.
+        """
+        if not (0 <= xy[0] < self.width and 0 <= xy[1] < self.height):
+            raise IndexError("image index out of range")
+        return tuple(int(value) for value in self.array[xy[1], xy[0]])
+
+    def __array__(self, dtype=None, copy=None):
+        if copy:
+            return self.array.copy() if dtype is None else self.array.astype(dtype)
+        return self.array if dtype is None else self.array.astype(dtype, copy=False)
@@ -0,0 +1,113 @@
+from threading import Lock
+
+import time
+import os
+
+
+class LocationHints(object):
+    """
+    Location hints store the last position each template was found at (per search region), searches try a small
+    window around that position first, falling back to the full region only if the template isn't found there.
+
+    Hits, misses and the (net) time saved compared to the last full region search are tracked per template.
+    """
+    def __init__(
+        self,
+        padding=10,
+    ):
+        """
+        Initialize a new set of location hints, using the specified padding around each hint.
+        """
+        self.padding = padding
+        # Locations and durations are keyed by (image, region), the duration
+        # is the time taken by the last full region search for that key.
+        self.locations = {}
+        self.durations = {}
+        # Stats are keyed by template name, and contain
+        # the hits, misses and time saved (in seconds).
+        self.stats = {}
+        # Hints are shared by every search worker, updates to our
+        # locations, durations and stats are made while holding this lock.
+        self.lock = Lock()
+
+    def _stats(self, image):
+        """
+        Retrieve the stats for the specified image, creating them if needed.
+
+        Our lock should be held while calling this.
+        """
+        name = os.path.basename(image).split(".")[0]
+
+        if name not in self.stats:
+            self.stats[name] = {
+                "hits": 0,
+                "misses": 0,
+                "saved": 0.0,
+            }
+        return self.stats[name]
+
+    @property
+    def hits(self):
+        with self.lock:
+            return sum(stats["hits"] for stats in self.stats.values())
+
+    @property
+    def misses(self):
+        with self.lock:
+            return sum(stats["misses"] for stats in self.stats.values())
+
+    @property
+    def saved(self):
+        with self.lock:
+            return sum(stats["saved"] for stats in self.stats.values())
+
+    def match(self, image, region, img_gray, template, precision, match):
+        """
+        Match the template against the grayscale image using the specified match function, trying the
+        window around the last known location first (if one exists).
+
+        The best (score, position) is returned, just like the match function itself.
+        """
+        key = (image, region)
+        location = self.locations.get(key)
+
+        if location is not None:
+            timestamp = time.perf_counter()
+            height, width = template.shape[:2]
+            x1, y1 = (
+                max(location[0] - self.padding, 0),
+                max(location[1] - self.padding, 0),
+            )
+            x2, y2 = (
+                min(location[0] + width + self.padding, img_gray.shape[1]),
+                min(location[1] + height + self.padding, img_gray.shape[0]),
+            )
+            if x2 - x1 >= width and y2 - y1 >= height:
+                max_val, max_loc = match(img_gray[y1:y2, x1:x2])
+
+                if max_val >= precision:
+                    max_loc = (x1 + max_loc[0], y1 + max_loc[1])
+
+                    with self.lock:
+                        stats = self._stats(image=image)
+                        stats["hits"] += 1
+                        stats["saved"] += max(self.durations.get(key, 0.0) - (time.perf_counter() - timestamp), 0.0)
+
+                        self.locations[key] = max_loc
+                    return max_val, max_loc
+            # Misses cost us the hinted search on top of the full region
+            # search, so that's taken away from our time saved.
+            with self.lock:
+                stats = self._stats(image=image)
+                stats["misses"] += 1
+                stats["saved"] -= time.perf_counter() - timestamp
+
+        timestamp = time.perf_counter()
+        max_val, max_loc = match(img_gray)
+
+        with self.lock:
+            self.durations[key] = time.perf_counter() - timestamp
+
+            if max_val >= precision:
+                self.locations[key] = max_loc
+        return max_val, max_loc
@@ -1,5 +1,5 @@
 from numpy import (
-    array,
+    asarray,
     sum,
 )
 
@@ -20,6 +20,6 @@ def compare_images(image_one, image_two, threshold):
     Compare two given images, determine if they are the same images.
     """
     return mse(
-        image_one=array(image_one),
-        image_two=array(image_two),
+        image_one=asarray(image_one),
+        image_two=asarray(image_two),
     ) < threshold
@@ -1,8 +1,180 @@
+from bot.core.frame import Frame
+
+from concurrent.futures import (
+    ThreadPoolExecutor,
+    as_completed,
+)
+from threading import Lock
+
 import numpy as np
 import random
 import cv2
 
 
+# A single executor is shared by every bot running in this process,
+# template matching releases the gil, so threads run matches in parallel.
+_executor = None
+_executor_lock = Lock()
+
+
+def get_executor(workers):
+    """
+    Retrieve the shared executor used for parallel template matching, creating it with the specified
+    number of workers if it doesn't exist yet.
+    """
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=workers,
+                thread_name_prefix="imagesearch",
+            )
+    return _executor
+
+
+def _frame(window, x1, y1, x2, y2, im=None):
+    """
+    Retrieve the frame used for searching, capturing the area if no image is specified.
+    """
+    if im is None:
+        im = window.screenshot(region=(x1, y1, x2, y2))
+    if not isinstance(im, Frame):
+        im = Frame(array=np.array(im))
+    return im
+
+
+def _template(image, templates=None):
+    """
+    Retrieve the grayscale template for the specified image path or array.
+    """
+    if isinstance(image, str):
+        return templates.get(image).gray if templates is not None else cv2.imread(image, 0)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def _pyramid(pyramid, precision):
+    """
+    Retrieve the pyramid matcher options for a search with the specified precision.
+    """
+    if not pyramid:
+        return None
+    return dict(pyramid, precision=precision)
+
+
+def _match(img_gray, template, pyramid=None):
+    """
+    Match the template against the grayscale image, returning the best (score, position).
+
+    The pyramid matcher is used instead when pyramid options are specified.
+    """
+    if pyramid:
+        return match_pyramid(img_gray=img_gray, template=template, **pyramid)
+
+    res = cv2.matchTemplate(img_gray, template, cv2.TM_CCOEFF_NORMED)
+    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+    return max_val, max_loc
+
+
+def match_pyramid(
+    img_gray,
+    template,
+    precision=0.8,
+    scale=0.5,
+    candidates=3,
+    margin=0.2,
+    min_size=12,
+):
+    """
+    Coarse to fine template matching, the image and template are matched at a reduced scale first, the best
+    candidate peaks are then refined at full resolution, only within a small window around each peak.
+
+    The (score, position) returned is always a full resolution score, small templates (or images) that can't be
+    reduced are matched at full resolution.
+    """
+    height, width = template.shape[:2]
+
+    if min(width, height) * scale < min_size or img_gray.shape[0] < height or img_gray.shape[1] < width:
+        return _match(img_gray=img_gray, template=template)
+
+    res = cv2.matchTemplate(
+        cv2.resize(img_gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA),
+        cv2.resize(template, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA),
+        cv2.TM_CCOEFF_NORMED,
+    )
+    # Coarse scores are always a bit lower than their full resolution
+    # counterparts, candidates only need to be within our margin.
+    threshold = precision - margin
+    # Any position within our refine window of a candidate is covered by the
+    # refinement of that candidate, so we suppress them when picking peaks.
+    pad = int(round(1 / scale)) + 1
+    best_val, best_loc = -1.0, (0, 0)
+
+    for _ in range(candidates):
+        min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+
+        if max_val < threshold:
+            break
+
+        x, y = (
+            int(max_loc[0] / scale),
+            int(max_loc[1] / scale),
+        )
+        x1, y1 = max(x - pad, 0), max(y - pad, 0)
+        x2, y2 = (
+            min(x + pad + width, img_gray.shape[1]),
+            min(y + pad + height, img_gray.shape[0]),
+        )
+        val, loc = _match(img_gray=img_gray[y1:y2, x1:x2], template=template)
+
+        if val > best_val:
+            best_val, best_loc = val, (x1 + loc[0], y1 + loc[1])
+
+        res[
+            max(max_loc[1] - pad, 0):max_loc[1] + pad + 1,
+            max(max_loc[0] - pad, 0):max_loc[0] + pad + 1,
+        ] = -1.0
+    return best_val, best_loc
+
+
+def _search(img_gray, image, region, precision=0.8, templates=None, pyramid=None, hints=None, prefilter=None):
+    """
+    Search for the image within the grayscale image, returning the best (score, position).
+
+    The prefilter and location hints are only used for image paths, arrays are always searched in full.
+    """
+    template = _template(image=image, templates=templates)
+    pyramid = _pyramid(pyramid=pyramid, precision=precision)
+    rejected = False
+
+    if prefilter is not None and isinstance(image, str):
+        rejected = not prefilter.possible(image=image, img_gray=img_gray, template=template)
+
+        if rejected and not prefilter.shadow:
+            return -1.0, [-1, -1]
+
+    def match(im):
+        return _match(img_gray=im, template=template, pyramid=pyramid)
+
+    if hints is not None and isinstance(image, str):
+        max_val, max_loc = hints.match(
+            image=image,
+            region=region,
+            img_gray=img_gray,
+            template=template,
+            precision=precision,
+            match=match,
+        )
+    else:
+        max_val, max_loc = match(img_gray)
+
+    if rejected and max_val >= precision:
+        # Only possible in shadow mode, the prefilter would
+        # have rejected a search that actually matched.
+        prefilter.false_rejection(image=image)
+    return max_val, max_loc
+
+
 def image_search_area(
     window,
     image,
@@ -12,28 +184,125 @@ def image_search_area(
     y2,
     precision=0.8,
     im=None,
+    templates=None,
+    pyramid=None,
+    hints=None,
+    prefilter=None,
 ):
     """
     Searches for an image within an area
-    """
-    if im is None:
-        im = window.screenshot(region=(x1, y1, x2, y2))
-
-    img_rgb = np.array(im)
-    img_gray = cv2.cvtColor(img_rgb, cv2.COLOR_BGR2GRAY)
 
-    if isinstance(image, str):
-        template = cv2.imread(image, 0)
-    else:
-        template = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    Image paths are read from the template store when one is specified, the pyramid
+    matcher, location hints and prefilter are used when they're specified.
+    """
+    im = _frame(window=window, x1=x1, y1=y1, x2=x2, y2=y2, im=im)
 
-    res = cv2.matchTemplate(img_gray, template, cv2.TM_CCOEFF_NORMED)
-    min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(res)
+    max_val, max_loc = _search(
+        img_gray=im.gray,
+        image=image,
+        region=(x1, y1, x2, y2),
+        precision=precision,
+        templates=templates,
+        pyramid=pyramid,
+        hints=hints,
+        prefilter=prefilter,
+    )
     if max_val < precision:
         return [-1, -1]
     return max_loc
 
 
+def image_search_batch(
+    window,
+    images,
+    x1,
+    y1,
+    x2,
+    y2,
+    precision=0.8,
+    im=None,
+    templates=None,
+    pyramid=None,
+    hints=None,
+    prefilter=None,
+    executor=None,
+    first=True,
+):
+    """
+    Searches for multiple images within an area, every image is matched against the same frame
+
+    A list of (image, score, position) matches is returned, ranked by score, if first is enabled,
+    searching stops at the first image found (in list order).
+
+    Images are matched in parallel when an executor is specified, the grayscale frame is only
+    ever read by each match, so it's shared between every worker.
+    """
+    img_gray = _frame(window=window, x1=x1, y1=y1, x2=x2, y2=y2, im=im).gray
+    matches = []
+
+    if executor is None or len(images) < 2:
+        for image in images:
+            max_val, max_loc = _search(
+                img_gray=img_gray,
+                image=image,
+                region=(x1, y1, x2, y2),
+                precision=precision,
+                templates=templates,
+                pyramid=pyramid,
+                hints=hints,
+                prefilter=prefilter,
+            )
+            if max_val >= precision:
+                matches.append((image, max_val, max_loc))
+
+                if first:
+                    break
+        return sorted(matches, key=lambda match: match[1], reverse=True)
+
+    # The cutoff is the index of the first image found so far, any images after
+    # it are cancelled (or skipped if they've already been picked up by a worker).
+    cutoff = [len(images)]
+
+    def search(index, image):
+        if index > cutoff[0]:
+            return None
+        return _search(
+            img_gray=img_gray,
+            image=image,
+            region=(x1, y1, x2, y2),
+            precision=precision,
+            templates=templates,
+            pyramid=pyramid,
+            hints=hints,
+            prefilter=prefilter,
+        )
+
+    futures = {
+        executor.submit(search, index, image): index for index, image in enumerate(images)
+    }
+    results = {}
+
+    for future in as_completed(futures):
+        if future.cancelled() or future.result() is None:
+            continue
+        index = futures[future]
+        max_val, max_loc = results[index] = future.result()
+
+        if first and max_val >= precision and index < cutoff[0]:
+            cutoff[0] = index
+
+            for other, other_index in futures.items():
+                if other_index > index:
+                    other.cancel()
+
+    for index in sorted(results):
+        max_val, max_loc = results[index]
+
+        if max_val >= precision and (not first or index == cutoff[0]):
+            matches.append((images[index], max_val, max_loc))
+    return sorted(matches, key=lambda match: match[1], reverse=True)
+
+
 def click_image(
     window,
     image,
@@ -43,12 +312,16 @@ def click_image(
     interval=0.0,
     offset=5,
     pause=0,
+    templates=None,
 ):
     """
     Click on the center of an image with a bit of randomness.
     """
-    img = cv2.imread(image)
-    height, width, channels = img.shape
+    if templates is not None:
+        template = templates.get(image)
+        height, width = template.height, template.width
+    else:
+        height, width = cv2.imread(image, 0).shape
 
     point = int(position[0] + r(width / 2, offset)), int(position[1] + r(height / 2, offset))
     window.click(point=point, clicks=clicks, interval=interval, button=button, offset=offset, pause=pause)
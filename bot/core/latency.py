@@ -0,0 +1,91 @@
+from collections import deque
+
+import numpy as np
+import time
+
+
+class LatencyProbe(object):
+    """
+    Latency probes measure how long a window takes to react to input, a point is clicked and the region around it
+    is polled until it changes, a rolling estimate of the window's latency is kept from the most recent samples.
+
+    Pauses can then be scaled to the measured latency, configured pauses are tuned for the slowest of machines and
+    are treated as a ceiling, while faster windows are able to shorten them (never below a floor).
+    """
+    def __init__(
+        self,
+        size=20,
+        threshold=8.0,
+        reference=0.25,
+        margin=2.0,
+        floor=0.25,
+    ):
+        """
+        Initialize a new latency probe.
+
+        The reference latency is the latency that our configured pauses were tuned for, pauses are scaled by
+        the estimate (including its safety margin) compared to the reference, and never below the floor.
+        """
+        self.samples = deque(maxlen=size)
+        self.threshold = threshold
+        self.reference = reference
+        self.margin = margin
+        self.floor = floor
+
+        self.timeouts = 0
+
+    @staticmethod
+    def difference(before, after):
+        """
+        Determine the mean absolute difference between two frames of the same size.
+        """
+        return np.abs(before.array.astype(np.int16) - after.array.astype(np.int16)).mean()
+
+    def measure(self, source, click, region, timeout=1.0, interval=0.005):
+        """
+        Measure the latency of the source specified, the click callable should send the input being measured,
+        the region of the source is polled (every interval) until it changes, or until the timeout is reached.
+
+        The latency measured is returned, or None if the region never changed.
+        """
+        # Only the region is ever copied out of our captures, and polling waits in between
+        # captures, so that other captures of the source aren't locked out while we poll.
+        before = source.screenshot(region=region)
+        # Polling once before clicking, anything the region does on its own (animations, etc)
+        # is included in our threshold, so that only a reaction to the click is measured.
+        threshold = max(self.threshold, self.difference(before, source.screenshot(region=region)) * 2)
+
+        timestamp = time.perf_counter()
+        click()
+
+        while time.perf_counter() - timestamp < timeout:
+            if self.difference(before, source.screenshot(region=region)) > threshold:
+                latency = time.perf_counter() - timestamp
+                self.samples.append(latency)
+
+                return latency
+            time.sleep(interval)
+
+        self.timeouts += 1
+
+    @property
+    def estimate(self):
+        """
+        Retrieve the current latency estimate (the median of our samples), None until a sample is available.
+        """
+        return float(np.median(self.samples)) if self.samples else None
+
+    @property
+    def factor(self):
+        """
+        Retrieve the factor our pauses are currently scaled by.
+        """
+        if self.estimate is None:
+            return 1.0
+        return min(max(self.estimate * self.margin / self.reference, self.floor), 1.0)
+
+    def scale(self, pause):
+        """
+        Scale the pause specified to our current latency estimate.
+        """
+        return pause * self.factor
@@ -0,0 +1,65 @@
+from functools import lru_cache
+
+import numpy as np
+
+
+# Easing curves map the fraction of a drag's duration that has elapsed,
+# to the fraction of the drag's distance that should be covered by then.
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t * t,
+    "ease_out": lambda t: 1 - (1 - t) * (1 - t),
+    "ease_in_out": lambda t: t * t * (3 - 2 * t),
+}
+
+
+def pack_parameters(points, y_padding=0):
+    """
+    Pack every (x, y) point specified into an LPARAM, the same way MAKELONG does, (y << 16) | x.
+    """
+    points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+
+    return (((points[:, 1] + y_padding) & 0xFFFF) << 16) | (points[:, 0] & 0xFFFF)
+
+
+def drag_path(start, end, steps=15, easing="ease_out"):
+    """
+    Generate the (steps, 2) points of a drag from the start point to the end point, the points are interpolated
+    along a straight line (vertical, horizontal or diagonal) and spaced by the easing curve specified.
+
+    The final point is always the end point.
+    """
+    if easing not in EASINGS:
+        raise ValueError(
+            "Invalid easing: \"%(easing)s\", must be one of: %(easings)s." % {
+                "easing": easing,
+                "easings": ", ".join(EASINGS),
+            }
+        )
+    start, end = (
+        np.asarray(start, dtype=np.float64),
+        np.asarray(end, dtype=np.float64),
+    )
+    progress = EASINGS[easing](np.linspace(0, 1, max(steps, 1) + 1)[1:])
+
+    return np.rint(start + (end - start) * progress[:, np.newaxis]).astype(np.int32)
+
+
+@lru_cache(maxsize=32)
+def circle_path(center, radius, loops=5, scale=0.7):
+    """
+    Generate the (loops, 240, 2) points of a circular drag around the center point specified, the radius is
+    scaled by the scale amount for each loop after the first, every third degree of each circle is skipped.
+
+    Paths are cached by their parameters, the array returned is read only and shared between callers.
+    """
+    degrees = np.radians(np.arange(360)[np.arange(360) % 3 != 0])
+    radii = radius * scale ** np.arange(loops)
+
+    path = np.stack((
+        center[0] + radii[:, np.newaxis] * np.cos(degrees),
+        center[1] + radii[:, np.newaxis] * np.sin(degrees),
+    ), axis=2).astype(np.int32)
+    path.flags.writeable = False
+
+    return path
@@ -0,0 +1,106 @@
+from bot.core.templates import TemplateStore
+
+from threading import Lock
+
+import numpy as np
+import os
+
+
+class Prefilter(object):
+    """
+    Prefilters reject searches that can't possibly match before any template matching takes place, each template
+    carries a compact intensity histogram, a search region must contain enough of the same intensities (histogram
+    intersection) for a match to be possible at all.
+
+    In shadow mode, nothing is actually rejected, searches that would have been rejected are matched anyway so
+    that any false rejections can be found and reported.
+    """
+    def __init__(
+        self,
+        bins=16,
+        threshold=0.5,
+        shadow=True,
+        templates=None,
+    ):
+        """
+        Initialize a new prefilter with the specified histogram bins and intersection threshold.
+
+        Signatures are generated from the template store specified (or a store of our own).
+        """
+        self.templates = templates if templates is not None else TemplateStore()
+        self.bins = bins
+        self.threshold = threshold
+        self.shadow = shadow
+        # Signatures are keyed by image, and store the fraction of
+        # the template's pixels that fall into each histogram bin.
+        self.signatures = {}
+        # The last grayscale image checked is stored with its histogram, every
+        # template in a batch is checked against the same image this way.
+        self._last = None
+
+        self.checks = 0
+        self.rejected = 0
+        # False rejections are keyed by template name, and
+        # are only ever found while running in shadow mode.
+        self.false_rejections = {}
+        # Prefilters are shared by every search worker, our counts
+        # and false rejections are updated while holding this lock.
+        self.lock = Lock()
+
+    def histogram(self, gray):
+        """
+        Generate the intensity histogram for the specified grayscale image.
+        """
+        return np.bincount((gray // (256 // self.bins)).ravel(), minlength=self.bins)
+
+    def signature(self, image):
+        """
+        Retrieve the signature (normalized histogram) for the specified image, generating it on first use.
+        """
+        if image not in self.signatures:
+            # Our frames are RGB while their grayscale conversion is BGR, the signature
+            # uses the same (swapped) conversion, so intensities line up with our frames.
+            histogram = self.histogram(gray=self.templates.get(path=image, scale=1.0).frame_gray)
+
+            self.signatures[image] = histogram / histogram.sum()
+        return self.signatures[image]
+
+    def possible(self, image, img_gray, template):
+        """
+        Determine whether or not the template could possibly be found within the grayscale image.
+        """
+        last = self._last
+
+        if last is not None and last[0] is img_gray:
+            histogram = last[1]
+        else:
+            histogram = self.histogram(gray=img_gray)
+            self._last = (img_gray, histogram)
+
+        # Signatures are scaled to the size of the template being
+        # used, so that scaled templates share the same signature.
+        signature = self.signature(image=image) * template.size
+
+        # A match is made of pixels within the search region, so the region must
+        # contain (most of) the template's intensities for a match to be possible.
+        possible = np.minimum(histogram, signature).sum() >= self.threshold * template.size
+
+        with self.lock:
+            self.checks += 1
+
+            if not possible:
+                self.rejected += 1
+        return possible
+
+    def false_rejection(self, image):
+        """
+        Track a false rejection for the specified image, found while running in shadow mode.
+        """
+        name = os.path.basename(image).split(".")[0]
+
+        with self.lock:
+            self.false_rejections[name] = self.false_rejections.get(name, 0) + 1
+
+    @property
+    def rejection_rate(self):
+        return self.rejected / self.checks if self.checks else 0.0
@@ -0,0 +1,161 @@
+from bot.core.imagesearch import image_search_area
+
+
+class TemplatePredicate(object):
+    """
+    Template predicates are true when the image is found within the region (or the whole frame) specified.
+    """
+    def __init__(
+        self,
+        image,
+        region=None,
+        precision=0.8,
+    ):
+        self.image = image
+        self.region = tuple(region) if region else None
+        self.precision = precision
+
+
+class ColorPredicate(object):
+    """
+    Color predicates are true when the point specified is within the color range specified.
+    """
+    def __init__(
+        self,
+        point,
+        color_range,
+    ):
+        self.point = tuple(point)
+        self.color_range = color_range
+
+
+class QueryResult(object):
+    """
+    Query results contain the outcome of every predicate in a screen query, template predicates store a
+    (found, position) tuple, color predicates store a boolean and nested queries store their own result.
+    """
+    def __init__(
+        self,
+        matched,
+        results,
+    ):
+        self.matched = matched
+        self.results = results
+
+    def __bool__(self):
+        return self.matched
+
+    def __getitem__(self, name):
+        return self.results[name]
+
+    def __repr__(self):
+        return "<QueryResult: %(matched)s %(results)s>" % {
+            "matched": self.matched,
+            "results": self.results,
+        }
+
+
+class ScreenQuery(object):
+    """
+    Screen queries bundle named template, color and (nested) query predicates together, every predicate is
+    evaluated against a single shared frame, templates are matched in parallel (when the bot has an executor
+    available) and every color predicate is checked with a single probe.
+
+    Queries match when all of their predicates are true ("all"), or when any of them are ("any").
+    """
+    MODES = {
+        "all": all,
+        "any": any,
+    }
+
+    def __init__(
+        self,
+        mode="all",
+        **predicates
+    ):
+        """
+        Initialize a new query with the specified mode and named predicates.
+        """
+        if mode not in self.MODES:
+            raise ValueError(
+                "Invalid query mode: \"%(mode)s\", must be one of: %(modes)s." % {
+                    "mode": mode,
+                    "modes": ", ".join(self.MODES),
+                }
+            )
+        self.mode = mode
+        self.predicates = predicates
+
+    def leaves(self):
+        """
+        Retrieve every template and color predicate within the query, including those in nested queries.
+        """
+        for predicate in self.predicates.values():
+            if isinstance(predicate, ScreenQuery):
+                yield from predicate.leaves()
+            else:
+                yield predicate
+
+    def _result(self, outcomes):
+        """
+        Build the result for this query using the outcomes of every leaf predicate.
+        """
+        results = {}
+
+        for name, predicate in self.predicates.items():
+            if isinstance(predicate, ScreenQuery):
+                results[name] = predicate._result(outcomes=outcomes)
+            else:
+                results[name] = outcomes[id(predicate)]
+
+        return QueryResult(
+            matched=self.MODES[self.mode](
+                result[0] if isinstance(result, tuple) else bool(result) for result in results.values()
+            ),
+            results=results,
+        )
+
+    def evaluate(self, bot, im=None):
+        """
+        Evaluate the query against the current frame of the bot specified (or the frame specified).
+        """
+        frame = im if im is not None else bot.snapshot()
+        # Converting our frame to grayscale up front (the conversion is cached on the
+        # frame), every template predicate (and worker) shares the same grayscale frame.
+        _ = frame.gray
+        leaves = list(self.leaves())
+        templates = [leaf for leaf in leaves if isinstance(leaf, TemplatePredicate)]
+        colors = [leaf for leaf in leaves if isinstance(leaf, ColorPredicate)]
+        outcomes = {}
+
+        def search(predicate):
+            # Every region is a zero-copy view of our shared frame.
+            region = predicate.region or (0, 0, frame.width, frame.height)
+            position = image_search_area(
+                window=bot.window,
+                image=predicate.image,
+                **bot.search_kwargs(
+                    region=region,
+                    precision=predicate.precision,
+                    im=frame.crop(box=region),
+                )
+            )
+            if position[0] == -1:
+                return False, position
+            return True, (region[0] + position[0], region[1] + position[1])
+
+        if bot.executor and len(templates) > 1:
+            for predicate, future in [(predicate, bot.executor.submit(search, predicate)) for predicate in templates]:
+                outcomes[id(predicate)] = future.result()
+        else:
+            for predicate in templates:
+                outcomes[id(predicate)] = search(predicate)
+
+        if colors:
+            for predicate, outcome in zip(colors, bot.probe(
+                probes=[(predicate.point, predicate.color_range) for predicate in colors],
+                im=frame,
+            )):
+                outcomes[id(predicate)] = bool(outcome)
+
+        return self._result(outcomes=outcomes)
@@ -0,0 +1,244 @@
+from bot.core.frame import Frame
+
+from queue import (
+    Queue,
+    Full,
+)
+from threading import Thread
+
+import numpy as np
+import json
+import mmap
+import time
+import zlib
+import os
+
+
+# Every frame written to an archive has a fixed size entry in the index,
+# allowing the archive to be seeked without reading any frame data.
+INDEX_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("offset", "<u8"),
+    ("length", "<u4"),
+    ("width", "<u2"),
+    ("height", "<u2"),
+    ("channels", "<u1"),
+    ("keyframe", "<u1"),
+])
+
+ARCHIVE_FRAMES = "frames.bin"
+ARCHIVE_INDEX = "index.bin"
+ARCHIVE_EVENTS = "events.jsonl"
+
+
+class SessionRecorder(Thread):
+    """
+    Session recorders stream every captured frame into an append-only archive, frames are delta encoded against
+    the previous frame and compressed one by one, inputs and the active plugin are stored alongside them.
+
+    All encoding and writing happens on the recorder thread, recording a frame only queues it.
+    """
+    def __init__(
+        self,
+        directory,
+        keyframe_interval=50,
+        compression=1,
+        size=256,
+    ):
+        """
+        Initialize a new recorder writing to the specified archive directory.
+        """
+        super().__init__(daemon=True)
+
+        self.directory = directory
+        self.keyframe_interval = keyframe_interval
+        self.compression = compression
+
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self.queue = Queue(maxsize=size)
+        # Frames are dropped (and counted) instead of blocking our
+        # bot loop if the recorder can not keep up with writing.
+        self.frames = 0
+        self.dropped = 0
+
+    def _put(self, item):
+        """
+        Queue an item for the recorder thread, dropping it if the queue is full.
+        """
+        try:
+            self.queue.put_nowait(item)
+        except Full:
+            self.dropped += 1
+
+    def record_frame(self, frame, plugin=None):
+        """
+        Record the specified frame, frames are never modified once captured so no copy is made here.
+        """
+        self._put(("frame", time.time(), plugin, frame.array))
+
+    def record_event(self, event, parameters=None, plugin=None):
+        """
+        Record the specified event (inputs, plugin execution, etc).
+        """
+        self._put(("event", time.time(), plugin, (event, parameters or {})))
+
+    def run(self):
+        """
+        Begin writing any queued frames and events until the recorder is stopped.
+        """
+        previous, offset = (
+            None,
+            0,
+        )
+
+        with open(os.path.join(self.directory, ARCHIVE_FRAMES), "ab") as frames, \
+                open(os.path.join(self.directory, ARCHIVE_INDEX), "ab") as index, \
+                open(os.path.join(self.directory, ARCHIVE_EVENTS), "a") as events:
+            offset = frames.tell()
+
+            while True:
+                item = self.queue.get()
+
+                if item is None:
+                    break
+
+                typ, timestamp, plugin, data = item
+
+                if typ == "event":
+                    event, parameters = data
+                    events.write(json.dumps({
+                        "timestamp": timestamp,
+                        "frame": self.frames,
+                        "plugin": plugin,
+                        "event": event,
+                        "parameters": parameters,
+                    }, default=str) + "\n")
+                    continue
+
+                array = np.ascontiguousarray(data)
+                keyframe = (
+                    previous is None
+                    or previous.shape != array.shape
+                    or self.frames % self.keyframe_interval == 0
+                )
+                # Delta frames store the xor against our previous frame, unchanged
+                # pixels become zero and compress extremely well.
+                chunk = zlib.compress(
+                    array.tobytes() if keyframe else np.bitwise_xor(array, previous).tobytes(),
+                    self.compression,
+                )
+                frames.write(chunk)
+                index.write(np.array([(
+                    timestamp,
+                    offset,
+                    len(chunk),
+                    array.shape[1],
+                    array.shape[0],
+                    array.shape[2] if array.ndim == 3 else 1,
+                    keyframe,
+                )], dtype=INDEX_DTYPE).tobytes())
+
+                offset += len(chunk)
+                previous = array
+
+                self.frames += 1
+
+    def stop(self):
+        """
+        Stop the recorder, any frames already queued are written first.
+        """
+        self.queue.put(None)
+
+        if self.is_alive():
+            self.join()
+
+
+class ArchiveReader(object):
+    """
+    Archive readers provide frame by frame access to an archive generated by a session recorder, the frame data
+    is memory mapped and only the frames required to rebuild the requested frame are decompressed.
+    """
+    def __init__(
+        self,
+        directory,
+    ):
+        """
+        Initialize a new reader for the specified archive directory.
+        """
+        self.directory = directory
+        self.index = np.fromfile(os.path.join(directory, ARCHIVE_INDEX), dtype=INDEX_DTYPE)
+
+        self._file = open(os.path.join(directory, ARCHIVE_FRAMES), "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if len(self.index) else None
+        # The last decoded frame is stored, sequential reads only
+        # ever need to apply a single delta this way.
+        self._last = None
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.read(index=i)
+
+    @property
+    def timestamps(self):
+        """
+        Retrieve the timestamps for every frame in the archive.
+        """
+        return self.index["timestamp"]
+
+    def seek(self, timestamp):
+        """
+        Retrieve the index of the last frame captured at or before the specified timestamp.
+        """
+        return max(int(np.searchsorted(self.timestamps, timestamp, side="right")) - 1, 0)
+
+    def _chunk(self, index):
+        """
+        Decompress the raw chunk for the specified frame index.
+        """
+        entry = self.index[index]
+        shape = (
+            (entry["height"], entry["width"], entry["channels"]) if entry["channels"] > 1 else
+            (entry["height"], entry["width"])
+        )
+        return np.frombuffer(
+            zlib.decompress(self._mmap[entry["offset"]:entry["offset"] + entry["length"]]),
+            dtype=np.uint8,
+        ).reshape(shape)
+
+    def read(self, index):
+        """
+        Read the frame at the specified index.
+        """
+        if self._last and self._last[0] <= index and not self.index["keyframe"][self._last[0] + 1:index + 1].any():
+            start, array = self._last
+        else:
+            # Rebuilding from the closest keyframe at or before our index.
+            start = int(np.flatnonzero(self.index["keyframe"][:index + 1])[-1])
+            array = self._chunk(index=start)
+
+        for i in range(start + 1, index + 1):
+            array = np.bitwise_xor(array, self._chunk(index=i))
+
+        self._last = (index, array)
+
+        return Frame(array=array)
+
+    def events(self):
+        """
+        Retrieve all events stored in the archive.
+        """
+        with open(os.path.join(self.directory, ARCHIVE_EVENTS), "r") as events:
+            return [json.loads(line) for line in events if line.strip()]
+
+    def close(self):
+        """
+        Close the archive, releasing our memory map.
+        """
+        if self._mmap:
+            self._mmap.close()
+        self._file.close()
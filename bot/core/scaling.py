@@ -0,0 +1,79 @@
+from bot.core.imagesearch import _match
+
+import numpy as np
+import copy
+
+
+# Every region, point and template is configured against
+# an emulator running at this (width, height).
+BASE_WIDTH = 480
+BASE_HEIGHT = 800
+
+
+def scale_coordinates(value, scale):
+    """
+    Scale every coordinate in the specified value (a number, or any nested lists/dicts of numbers).
+    """
+    if isinstance(value, dict):
+        return {key: scale_coordinates(value=val, scale=scale) for key, val in value.items()}
+    if isinstance(value, list):
+        return [scale_coordinates(value=val, scale=scale) for val in value]
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(round(value * scale))
+    return value
+
+
+def scale_configurations(configurations, scale):
+    """
+    Scale every point and region within the specified configurations, returning the new configurations.
+
+    Any other pixel values (paddings, offsets, radii) are only scaled when their dotted path is listed
+    in "global.scale.pixels", every other value is treated as unit-less and left as is.
+    """
+    configurations = copy.deepcopy(configurations)
+    configurations["points"] = scale_coordinates(value=configurations["points"], scale=scale)
+    configurations["regions"] = scale_coordinates(value=configurations["regions"], scale=scale)
+
+    for path in configurations["global"]["scale"]["pixels"]:
+        *parents, key = path.split(".")
+        value = configurations
+
+        for parent in parents:
+            value = value[parent]
+        value[key] = scale_coordinates(value=value[key], scale=scale)
+    return configurations
+
+
+def calibrate_scale(
+    frame,
+    templates,
+    anchor,
+    scale,
+    search_range=0.1,
+    steps=9,
+    precision=0.8,
+):
+    """
+    Calibrate the scale of a frame by searching for the anchor template at scales around the initial scale
+    specified, returning the best (scale, score) found.
+
+    None is returned if the anchor template isn't found at any scale with the specified precision.
+    """
+    img_gray = frame.gray
+    best_scale, best_val = None, -1.0
+
+    for candidate in np.unique(np.round(np.linspace(scale - search_range, scale + search_range, steps), 3)):
+        if candidate <= 0:
+            continue
+        template = templates.get(path=anchor, scale=float(candidate)).gray
+
+        if template.shape[0] > img_gray.shape[0] or template.shape[1] > img_gray.shape[1]:
+            continue
+        max_val, max_loc = _match(img_gray=img_gray, template=template)
+
+        if max_val > best_val:
+            best_scale, best_val = float(candidate), max_val
+
+    if best_val < precision:
+        return None
+    return best_scale, best_val
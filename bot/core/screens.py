@@ -0,0 +1,172 @@
+from bot.core.source import ReplaySource
+
+import numpy as np
+import time
+import cv2
+import sys
+import os
+
+
+class ScreenClassifier(object):
+    """
+    Screen classifiers determine which game screen a frame is showing in a single pass, every frame is reduced to a
+    compact fingerprint (a tiny, normalized grayscale thumbnail) that's compared against the signatures of known
+    screens with a single matrix product, the closest signature wins.
+
+    Signatures are generated from a labelled replay set, a directory containing one replay path per screen (named
+    after the screen), each containing frames of that screen.
+    """
+    FINGERPRINT_SIZE = (24, 40)
+
+    def __init__(
+        self,
+        labels=None,
+        signatures=None,
+        confidence=0.9,
+    ):
+        """
+        Initialize a new classifier with the specified labels and signatures (one label per signature).
+        """
+        self.labels = np.asarray(labels if labels is not None else [], dtype=str)
+        self.signatures = np.asarray(
+            signatures if signatures is not None else np.empty((0, self.FINGERPRINT_SIZE[0] * self.FINGERPRINT_SIZE[1])),
+            dtype=np.float32,
+        )
+        self.confidence = confidence
+
+    def __len__(self):
+        return len(self.signatures)
+
+    @property
+    def screens(self):
+        """
+        Retrieve every screen known by the classifier.
+        """
+        return sorted(set(self.labels))
+
+    @classmethod
+    def fingerprint(cls, frame):
+        """
+        Generate the fingerprint for the specified frame.
+        """
+        thumbnail = cv2.resize(
+            src=frame.gray,
+            dsize=cls.FINGERPRINT_SIZE,
+            interpolation=cv2.INTER_AREA,
+        ).astype(np.float32).ravel()
+        # Fingerprints are zero mean and unit length, so that comparing two
+        # of them is a single dot product (their correlation).
+        thumbnail -= thumbnail.mean()
+        norm = np.linalg.norm(thumbnail)
+
+        return thumbnail / norm if norm else thumbnail
+
+    @classmethod
+    def train(cls, directory, limit=32, confidence=0.9):
+        """
+        Generate a new classifier from the labelled replay set in the specified directory, at most limit
+        signatures are kept for each screen (evenly spaced throughout the replay).
+        """
+        labels, signatures = [], []
+
+        for label in sorted(os.listdir(directory)):
+            source = ReplaySource(path=os.path.join(directory, label), loop=False)
+            fingerprints = [cls.fingerprint(frame=source.screenshot()) for _ in source.names]
+
+            for index in np.unique(np.linspace(0, len(fingerprints) - 1, min(limit, len(fingerprints))).astype(int)):
+                labels.append(label)
+                signatures.append(fingerprints[index])
+
+        return cls(
+            labels=labels,
+            signatures=np.array(signatures),
+            confidence=confidence,
+        )
+
+    @classmethod
+    def load(cls, path, confidence=0.9):
+        """
+        Load a classifier from the signatures file specified.
+        """
+        with np.load(path) as data:
+            return cls(
+                labels=data["labels"],
+                signatures=data["signatures"],
+                confidence=confidence,
+            )
+
+    def save(self, path):
+        """
+        Save the classifier signatures to the file specified.
+        """
+        with open(path, "wb") as file:
+            np.savez(file, labels=self.labels, signatures=self.signatures)
+
+    def classify(self, frame):
+        """
+        Classify the specified frame, returning the (screen, confidence) of the closest signature.
+
+        The screen returned is None if no signature is within our confidence.
+        """
+        if not len(self):
+            return None, 0.0
+
+        similarities = self.signatures @ self.fingerprint(frame=frame)
+        index = int(np.argmax(similarities))
+        confidence = float(similarities[index])
+
+        if confidence < self.confidence:
+            return None, confidence
+        return str(self.labels[index]), confidence
+
+    def evaluate(self, directory):
+        """
+        Evaluate the classifier against the labelled replay set in the specified directory, returning
+        the accuracy and latency (average seconds per classification) for each screen.
+        """
+        results = {}
+
+        for label in sorted(os.listdir(directory)):
+            source = ReplaySource(path=os.path.join(directory, label), loop=False)
+            correct, elapsed = 0, 0.0
+
+            for _ in source.names:
+                frame = source.screenshot()
+                timestamp = time.perf_counter()
+                screen, confidence = self.classify(frame=frame)
+                elapsed += time.perf_counter() - timestamp
+                correct += screen == label
+
+            results[label] = {
+                "frames": len(source.names),
+                "accuracy": correct / len(source.names),
+                "latency": elapsed / len(source.names),
+            }
+        return results
+
+
+if __name__ == "__main__":
+    # Usage: python -m bot.core.screens train <labelled directory> <signatures file>
+    #        python -m bot.core.screens evaluate <labelled directory> <signatures file>
+    command, directory, path = sys.argv[1:4]
+
+    if command == "train":
+        classifier = ScreenClassifier.train(directory=directory)
+        classifier.save(path=path)
+        print(
+            "Trained %(signatures)s Signature(s) For %(screens)s Screen(s): %(path)s" % {
+                "signatures": len(classifier),
+                "screens": len(classifier.screens),
+                "path": path,
+            }
+        )
+    else:
+        for screen, result in ScreenClassifier.load(path=path).evaluate(directory=directory).items():
+            print(
+                "%(screen)s: %(accuracy).2f%% Accuracy, %(latency).3fms Latency (%(frames)s Frame(s))" % {
+                    "screen": screen,
+                    "accuracy": result["accuracy"] * 100,
+                    "latency": result["latency"] * 1000,
+                    "frames": result["frames"],
+                }
+            )
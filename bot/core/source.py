@@ -0,0 +1,397 @@
+from bot.core.exceptions import (
+    StoppedException,
+)
+from bot.core.recorder import (
+    ArchiveReader,
+    ARCHIVE_INDEX,
+)
+from bot.core.frame import Frame
+
+from threading import current_thread
+
+import numpy as np
+import zipfile
+import random
+import time
+import cv2
+import os
+
+
+class FrameSource(object):
+    """
+    Frame sources encapsulate everything a bot session needs from an emulator: frame capture, the geometry
+    of the source and the input sinks (clicks, drags). Implementations should override the capture, geometry
+    and input functionality.
+    """
+    def __init__(self):
+        """
+        Initialize the shared frame source attributes.
+        """
+        self.instance = None
+        self.get_settings_obj = None
+        self.force_stop_func = None
+        # Hard code/set these to handle some additional work
+        # done while taking screenshots and calculating points...
+        self.emulator_width = 480
+        self.emulator_height = 800
+        # The generation is incremented whenever an input event is sent
+        # to the source, frames captured during an older generation
+        # may no longer reflect what's on the screen.
+        self.generation = 0
+        # Track the total time (in seconds) spent waiting on our screenshot
+        # lock, this is a measure of contention on this source's captures.
+        self.screenshot_lock_wait = 0.0
+        # Input listeners are called with the (event, parameters) of
+        # every input sent to the source, recorders use this.
+        self.input_listeners = []
+        # The dispatcher thread sending inputs to the source (if any), the failsafe and
+        # force stop checks are made by the bot before queueing, only long running inputs
+        # are interrupted on this thread (see _interrupt).
+        self.dispatcher = None
+
+    def configure(
+        self,
+        instance,
+        get_settings_obj,
+        force_stop_func,
+    ):
+        """
+        Configure the given source, ensuring the expected settings are included.
+        """
+        self.instance = instance
+        self.get_settings_obj = get_settings_obj
+        self.force_stop_func = force_stop_func
+
+    def __str__(self):
+        return "%(text)s (X: %(x)s, Y: %(y)s, W: %(w)s, H: %(h)s)" % {
+            "text": self.text,
+            "x": self.x,
+            "y": self.y,
+            "w": self.width,
+            "h": self.height,
+        }
+
+    @property
+    def text(self):
+        """
+        Retrieve the text (title) value for the source.
+        """
+        raise NotImplementedError
+
+    @property
+    def rectangle(self):
+        """
+        Retrieve the client rectangle for the source.
+        """
+        raise NotImplementedError
+
+    @property
+    def x(self):
+        """
+        Retrieve the x value for the source.
+        """
+        return self.rectangle[0]
+
+    @property
+    def y(self):
+        """
+        Retrieve the y value for the source.
+        """
+        return self.rectangle[1]
+
+    @property
+    def width(self):
+        """
+        Retrieve the width for the source.
+        """
+        rectangle = self.rectangle
+        return rectangle[2] - rectangle[0]
+
+    @property
+    def height(self):
+        """
+        Retrieve the height for the source.
+        """
+        rectangle = self.rectangle
+        return rectangle[3] - rectangle[1]
+
+    @property
+    def y_padding(self):
+        """
+        Retrieve the amount of y padding for the source.
+        """
+        return self.height - self.emulator_height
+
+    @staticmethod
+    def _gen_offset(point, amount):
+        """
+        Generate an offset on the given point specified (x, y).
+        """
+        if not amount:
+            # Maybe the amount specified is just 0,
+            # return the original point.
+            return point
+
+        # Modify our points to use a random value between
+        # the original value with amount offset.
+        return (
+            point[0] + random.randint(-amount, amount),
+            point[1] + random.randint(-amount, amount)
+        )
+
+    def _dispatching(self):
+        """
+        Determine whether or not the current thread is our dispatcher thread.
+        """
+        return self.dispatcher is not None and current_thread() is self.dispatcher
+
+    def _failsafe(self):
+        """
+        Perform the proper failsafe check here (if enabled).
+        """
+        pass
+
+    def _force_stop(self):
+        """
+        Perform the proper force stop check here (if enabled).
+        """
+        if self._dispatching():
+            return
+        if self.force_stop_func and self.force_stop_func(instance=self.instance):
+            self.force_stop_func(instance=self.instance, _set=True)
+            raise StoppedException
+
+    def _failsafe_check(self):
+        """
+        Perform the failsafe check here, using the failsafe setting last read by our failsafe (if enabled).
+        """
+        pass
+
+    def _interrupt(self):
+        """
+        Perform the failsafe and force stop checks in between the steps of a long running input.
+
+        Unlike our other checks, these are also made on the dispatcher thread, where no settings are read and the
+        force stop is never reset (the thread queueing inputs resets it the next time it checks).
+        """
+        if not self._dispatching():
+            self._failsafe()
+            self._force_stop()
+            return
+        self._failsafe_check()
+
+        if self.force_stop_func and self.force_stop_func(instance=self.instance):
+            raise StoppedException
+
+    def _input(self, event, **parameters):
+        """
+        Track that an input event is being sent to the source.
+        """
+        self.generation += 1
+
+        for listener in self.input_listeners:
+            listener(event, parameters)
+
+    def search(self, value):
+        """
+        Perform a check to see if a specified value is present within the sources text value.
+        """
+        if isinstance(value, str):
+            value = [value]
+        else:
+            value = [v for v in value]
+
+        for val in value:
+            # Use "lower" so that we don't deal with casing
+            # issues when searching for possible emulators.
+            if self.text.lower().find(val.lower()) != -1:
+                return True
+
+        return False
+
+    def click(self, point, clicks=1, interval=0.0, button="left", offset=5, pause=0.0):
+        """
+        Perform a click on the source.
+        """
+        raise NotImplementedError
+
+    def taps(self, points, button="left"):
+        """
+        Perform a sequence of clicks on the source, the points are clicked as-is (no offsets are generated),
+        and the failsafe and force stop checks only take place once for the whole sequence.
+        """
+        raise NotImplementedError
+
+    def drag(self, start, end, button="left", pause=0.0, duration=None, steps=15, easing="ease_out"):
+        """
+        Perform a drag on the source, over the duration specified (if any).
+        """
+        raise NotImplementedError
+
+    def drag_circle(self, radius, button="left", offset=5, loops=5, scale=0.7, interval=0.0001, pause=0.0):
+        """
+        Perform a circular drag on the source.
+        """
+        raise NotImplementedError
+
+    def screenshot(self, region=None, refresh=True):
+        """
+        Perform a screenshot on the source or region within, returning a frame.
+
+        If refresh is disabled, the last capture taken is re-read instead of capturing again.
+        """
+        raise NotImplementedError
+
+    def release(self):
+        """
+        Release any capture resources currently held by the source.
+        """
+        pass
+
+
+class ReplaySource(FrameSource):
+    """
+    Replay sources serve previously recorded frames from a directory or zip archive of images, or a session
+    recorder archive, inputs are never sent anywhere, they're logged in memory instead. Every new capture moves
+    on to the next frame.
+
+    This lets the vision pipeline (and whole plugins) run without an emulator, at full speed.
+    """
+    EXTENSIONS = (
+        ".png",
+        ".jpg",
+        ".bmp",
+    )
+
+    def __init__(
+        self,
+        path,
+        loop=True,
+    ):
+        """
+        Initialize a new replay source with the specified directory or archive path.
+        """
+        super().__init__()
+
+        self.path = path
+        self.loop = loop
+        self.archive = zipfile.ZipFile(path) if zipfile.is_zipfile(path) else None
+        self.recording = ArchiveReader(directory=path) if (
+            os.path.isdir(path) and os.path.exists(os.path.join(path, ARCHIVE_INDEX))
+        ) else None
+
+        if self.recording:
+            self.names = list(range(len(self.recording)))
+        elif self.archive:
+            self.names = sorted(
+                name for name in self.archive.namelist() if name.lower().endswith(self.EXTENSIONS)
+            )
+        else:
+            self.names = sorted(
+                name for name in os.listdir(path) if name.lower().endswith(self.EXTENSIONS)
+            )
+        if not self.names:
+            raise ValueError(
+                "No frames could be found to replay in: \"%(path)s\"." % {
+                    "path": path,
+                }
+            )
+
+        self.index = -1
+        self.frame = None
+        # All inputs "sent" to the source are stored here, each input
+        # is a tuple containing (timestamp, event, parameters).
+        self.inputs = []
+
+    def _read(self, index):
+        """
+        Read and decode the frame at the specified index.
+        """
+        if self.recording:
+            return self.recording.read(index=index)
+        if self.archive:
+            data = self.archive.read(self.names[index])
+        else:
+            with open(os.path.join(self.path, self.names[index]), "rb") as file:
+                data = file.read()
+
+        array = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+        # Images are decoded as BGR, our frames are always RGB.
+        return Frame(array=np.ascontiguousarray(array[:, :, ::-1]))
+
+    def _log(self, event, **parameters):
+        """
+        Log an input event to our in memory list of inputs.
+        """
+        self._input(event, **parameters)
+        self.inputs.append((
+            time.perf_counter(),
+            event,
+            parameters,
+        ))
+
+    @property
+    def text(self):
+        """
+        Retrieve the text (title) value for the source.
+        """
+        return "Replay: %(path)s" % {
+            "path": self.path,
+        }
+
+    @property
+    def rectangle(self):
+        """
+        Retrieve the client rectangle for the source, our frames contain no padding.
+        """
+        return (
+            0,
+            0,
+            self.emulator_width,
+            self.emulator_height,
+        )
+
+    def click(self, point, clicks=1, interval=0.0, button="left", offset=5, pause=0.0):
+        """
+        Log a click on the source.
+        """
+        self._force_stop()
+        self._log(event="click", point=tuple(point), clicks=clicks, button=button)
+
+    def taps(self, points, button="left"):
+        """
+        Log a sequence of clicks on the source.
+        """
+        self._force_stop()
+        self._log(event="taps", points=np.asarray(points).tolist(), button=button)
+
+    def drag(self, start, end, button="left", pause=0.0, duration=None, steps=15, easing="ease_out"):
+        """
+        Log a drag on the source.
+        """
+        self._force_stop()
+        self._log(event="drag", start=tuple(start), end=tuple(end), button=button, duration=duration, steps=steps)
+
+    def drag_circle(self, radius, button="left", offset=5, loops=5, scale=0.7, interval=0.0001, pause=0.0):
+        """
+        Log a circular drag on the source.
+        """
+        for loop in range(loops):
+            self._interrupt()
+        self._log(event="drag_circle", radius=radius, loops=loops, scale=scale, button=button)
+
+    def screenshot(self, region=None, refresh=True):
+        """
+        Retrieve the current recorded frame or region within, moving on to the next frame if refreshing.
+        """
+        if refresh or self.frame is None:
+            if self.index + 1 < len(self.names):
+                self.index += 1
+            elif self.loop:
+                self.index = 0
+            self.frame = self._read(index=self.index)
+            self.emulator_width, self.emulator_height = self.frame.size
+
+        if region:
+            return self.frame.crop(box=region)
+        return self.frame
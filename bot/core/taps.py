@@ -0,0 +1,102 @@
+import numpy as np
+
+
+class TapSchedule(object):
+    """
+    Tap schedules compile an entire tapping sequence up front, every tap point (including its jitter) is generated
+    at once, along with the checkpoints that should run in between taps (fairies, collapsing, etc).
+
+    Schedules are dispatched segment by segment, each segment begins at a checkpoint and runs until the next one.
+    """
+    def __init__(
+        self,
+        points,
+        checkpoints,
+    ):
+        """
+        Initialize a new schedule with the specified (N, 2) points and checkpoint masks.
+        """
+        self.points = points
+        self.checkpoints = checkpoints
+
+    def __len__(self):
+        return len(self.points)
+
+    @classmethod
+    def compile(
+        cls,
+        tap_map,
+        heroes_loops=3,
+        heroes_remove_percent=0.25,
+        offset_min=1,
+        offset_max=6,
+        prevent_region=None,
+        checkpoints=None,
+        rng=None,
+    ):
+        """
+        Compile a new schedule from the specified tap map (fairies, heroes, pet, master).
+
+        The heroes map is shuffled and reused for each heroes loop, with a percentage of points removed each time,
+        any jittered points within the prevent region are removed, checkpoints should be a dictionary of name -> modulo.
+        """
+        rng = rng or np.random.default_rng()
+        maps = []
+
+        for key in ["fairies", "heroes", "pet", "master"]:
+            points = np.asarray(tap_map[key], dtype=np.int32).reshape(-1, 2)
+
+            if key == "heroes":
+                for i in range(heroes_loops):
+                    # The "heroes" key will shuffle and reuse the map, this aids in the
+                    # process of activating the astral awakening skills, some points are
+                    # also removed (cumulatively) after each shuffle.
+                    points = points[rng.permutation(len(points))]
+                    points = points[rng.random(len(points)) > heroes_remove_percent]
+                    maps.append(points)
+            else:
+                maps.append(points)
+
+        points = np.concatenate(maps)
+
+        # Every tap gets its own random offset amount, and then
+        # a random jitter within that amount on each axis.
+        offsets = rng.integers(offset_min, offset_max, size=len(points), endpoint=True)[:, np.newaxis]
+        points = points + rng.integers(-offsets, offsets, size=(len(points), 2), endpoint=True).astype(np.int32)
+
+        if prevent_region:
+            # Filtering once our jitter is applied, so that a point just outside
+            # of the region is never jittered into it.
+            points = points[~(
+                (prevent_region[0] <= points[:, 0]) & (points[:, 0] <= prevent_region[2])
+                & (prevent_region[1] <= points[:, 1]) & (points[:, 1] <= prevent_region[3])
+            )]
+
+        indexes = np.arange(len(points))
+
+        return cls(
+            points=points,
+            checkpoints={
+                name: indexes % modulo == 0 for name, modulo in (checkpoints or {}).items()
+            },
+        )
+
+    def segments(self):
+        """
+        Generate every segment in the schedule, as (checkpoints, points) tuples, the checkpoints being
+        a list of checkpoint names that should run before the segment's points are tapped.
+        """
+        if not len(self):
+            return
+
+        boundaries = np.zeros(len(self), dtype=bool)
+        boundaries[0] = True
+
+        for mask in self.checkpoints.values():
+            boundaries |= mask
+
+        starts = np.flatnonzero(boundaries)
+        ends = np.append(starts[1:], len(self))
+
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            yield [name for name, mask in self.checkpoints.items() if mask[start]], self.points[start:end]
@@ -0,0 +1,157 @@
+import numpy as np
+import time
+import cv2
+import os
+
+
+class Template(object):
+    """
+    Templates hold a single decoded (grayscale) image used for searching, along with its dimensions.
+    """
+    def __init__(
+        self,
+        name,
+        path,
+        gray,
+        frame_gray=None,
+    ):
+        """
+        Initialize a new template with the specified name, path and grayscale array.
+
+        The frame grayscale array is the template converted the same way our frames are (RGB frames use a
+        BGR conversion), it's only available for templates decoded from disk, not for scaled templates.
+        """
+        self.name = name
+        self.path = path
+        self.gray = gray
+        self.frame_gray = frame_gray
+        self.height, self.width = gray.shape[:2]
+
+    def __str__(self):
+        return "%(name)s (W: %(width)s, H: %(height)s)" % {
+            "name": self.name,
+            "width": self.width,
+            "height": self.height,
+        }
+
+
+class TemplateStore(object):
+    """
+    Template stores decode every image available to the bot once, keeping them in memory so that
+    searches and clicks never need to read an image from disk.
+
+    When a scale is set on the store, templates are resized to that scale once and cached.
+    """
+    EXTENSIONS = (
+        ".png",
+        ".jpg",
+        ".bmp",
+    )
+
+    def __init__(self):
+        """
+        Initialize a new empty template store.
+        """
+        # Templates are keyed by their path, the bot (and every plugin)
+        # passes image paths around, so lookups can be done directly.
+        self.templates = {}
+        self.load_time = 0.0
+        # Scaled templates are keyed by (path, scale), and are only
+        # generated the first time they're requested.
+        self.scale = 1.0
+        self.scaled = {}
+
+    def __len__(self):
+        return len(self.templates)
+
+    def __contains__(self, path):
+        return path in self.templates
+
+    @property
+    def nbytes(self):
+        """
+        Retrieve the total memory footprint (in bytes) of every template in the store.
+        """
+        return sum(
+            template.gray.nbytes + template.frame_gray.nbytes for template in self.templates.values()
+        ) + sum(
+            template.gray.nbytes for template in self.scaled.values()
+        )
+
+    def load(self, path):
+        """
+        Decode and store the image at the specified path, returning the new template.
+        """
+        # Decoding the file contents twice (grayscale and color), our grayscale template
+        # must be identical to a grayscale read, which a color conversion isn't.
+        data = np.fromfile(path, dtype=np.uint8)
+        gray, color = (
+            cv2.imdecode(data, cv2.IMREAD_GRAYSCALE),
+            cv2.imdecode(data, cv2.IMREAD_COLOR),
+        )
+        if gray is None:
+            raise ValueError(
+                "Template: \"%(path)s\" could not be decoded." % {
+                    "path": path,
+                }
+            )
+        self.templates[path] = Template(
+            name=os.path.basename(path).split(".")[0],
+            path=path,
+            gray=gray,
+            frame_gray=cv2.cvtColor(color, cv2.COLOR_RGB2GRAY),
+        )
+        return self.templates[path]
+
+    def load_directory(self, directory):
+        """
+        Decode and store every image within the specified directory.
+        """
+        timestamp = time.perf_counter()
+
+        with os.scandir(directory) as scan:
+            for file in scan:
+                if file.name.lower().endswith(self.EXTENSIONS):
+                    self.load(path=file.path)
+
+        self.load_time += time.perf_counter() - timestamp
+
+    def rescale(self, scale):
+        """
+        Set the scale used by the store, every template is resized to the new scale up front.
+        """
+        self.scale = scale
+
+        for path in self.templates:
+            self.get(path=path)
+
+    def get(self, path, scale=None):
+        """
+        Retrieve the template for the specified path (at our current scale, or the scale specified), images
+        outside of our preloaded directory are decoded and stored the first time they're used.
+        """
+        try:
+            template = self.templates[path]
+        except KeyError:
+            template = self.load(path=path)
+
+        scale = scale or self.scale
+
+        if scale == 1.0:
+            return template
+        try:
+            return self.scaled[(path, scale)]
+        except KeyError:
+            self.scaled[(path, scale)] = Template(
+                name=template.name,
+                path=path,
+                gray=cv2.resize(
+                    src=template.gray,
+                    dsize=(
+                        max(int(round(template.width * scale)), 1),
+                        max(int(round(template.height * scale)), 1),
+                    ),
+                    interpolation=cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR,
+                ),
+            )
+        return self.scaled[(path, scale)]
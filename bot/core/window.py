@@ -1,11 +1,18 @@
 from bot.core.exceptions import (
     WindowNotFoundError,
-    StoppedException,
+    FailSafeException,
+)
+from bot.core.source import FrameSource
+from bot.core.frame import Frame
+from bot.core.paths import (
+    pack_parameters,
+    drag_path,
+    circle_path,
 )
 
-from PIL import Image
 from ctypes import windll
 
+from contextlib import contextmanager
 from threading import Lock
 from enum import Enum
 
@@ -14,16 +21,28 @@ import win32ui
 import win32api
 import win32con
 
+import numpy as np
 import pyautogui
-import random
 import time
-import math
 
 
-_screenshot_lock = Lock()
+# Screenshot locks are stored by their hwnd, one window is never captured
+# twice at once, while separate windows can be captured at the same time.
+_screenshot_locks = {}
+_screenshot_locks_lock = Lock()
+
+
+def get_screenshot_lock(hwnd):
+    """
+    Retrieve the screenshot lock used for the specified hwnd, creating it if needed.
+    """
+    with _screenshot_locks_lock:
+        if hwnd not in _screenshot_locks:
+            _screenshot_locks[hwnd] = Lock()
+        return _screenshot_locks[hwnd]
 
 
-class Window(object):
+class Window(FrameSource):
     """
     Window objects encapsulate all of the functionality that handles background window screenshots, clicks, drags.
     """
@@ -51,41 +70,28 @@ class Window(object):
     def __init__(
         self,
         hwnd,
+        geometry_max_age=5,
     ):
         """
         Initialize a new window object with the specified hwnd value.
+
+        Window geometry is cached for inputs and only refreshed once it's older than the geometry max age
+        (in seconds), sessions configure this through "global.capture.geometry_max_age".
         """
-        self.get_settings_obj = None
-        self.force_stop_func = None
-        # Hard code/set these to handle some additional work
-        # done while taking screenshots and calculating points...
-        self.emulator_width = 480
-        self.emulator_height = 800
+        super().__init__()
         # "hwnd" is used throughout to send signals
         # to the window in question...
         self.hwnd = int(hwnd)
-
-    def configure(
-        self,
-        instance,
-        get_settings_obj,
-        force_stop_func,
-    ):
-        """
-        Configure the given window, ensuring the expected settings are included.
-        """
-        self.instance = instance
-        self.get_settings_obj = get_settings_obj
-        self.force_stop_func = force_stop_func
-
-    def __str__(self):
-        return "%(text)s (X: %(x)s, Y: %(y)s, W: %(w)s, H: %(h)s)" % {
-            "text": self.text,
-            "x": self.x,
-            "y": self.y,
-            "w": self.width,
-            "h": self.height,
-        }
+        # Capture context is created on the first screenshot and reused
+        # until the window is resized or explicitly released.
+        self._capture = None
+        # Geometry snapshot, (x1, y1, x2, y2) as well as the time
+        # it was taken, this avoids a syscall on every click.
+        self._rectangle = None
+        self._rectangle_timestamp = None
+        self.geometry_max_age = geometry_max_age
+        # The failsafe setting last read, see _failsafe.
+        self._failsafe_enabled = False
 
     @property
     def text(self):
@@ -94,96 +100,49 @@ class Window(object):
         """
         return win32gui.GetWindowText(self.hwnd)
 
-    @property
-    def rectangle(self):
+    def refresh_geometry(self):
         """
-        Retrieve the client rectangle for the window.
+        Refresh the cached client rectangle for the window.
         """
-        return win32gui.GetWindowRect(self.hwnd)
+        self._rectangle = win32gui.GetWindowRect(self.hwnd)
+        self._rectangle_timestamp = time.perf_counter()
 
-    @property
-    def x(self):
-        """
-        Retrieve the x value for the window.
-        """
-        return self.rectangle[0]
-
-    @property
-    def y(self):
-        """
-        Retrieve the y value for the window.
-        """
-        return self.rectangle[1]
+        return self._rectangle
 
     @property
-    def width(self):
-        """
-        Retrieve the width for the window.
-        """
-        return self.rectangle[2] - self.x
-
-    @property
-    def height(self):
-        """
-        Retrieve the height for the window.
-        """
-        return self.rectangle[3] - self.y
-
-    @property
-    def y_padding(self):
-        """
-        Retrieve the amount of y padding for the window.
+    def rectangle(self):
         """
-        return self.height - self.emulator_height
+        Retrieve the client rectangle for the window, refreshing it if the cached geometry is stale.
 
-    @staticmethod
-    def _gen_offset(point, amount):
+        Captures always refresh the geometry (see screenshot), so the max age only applies to the
+        inputs sent in between captures.
         """
-        Generate an offset on the given point specified (x, y).
-        """
-        if not amount:
-            # Maybe the amount specified is just 0,
-            # return the original point.
-            return point
-
-        # Modify our points to use a random value between
-        # the original value with amount offset.
-        return (
-            point[0] + random.randint(-amount, amount),
-            point[1] + random.randint(-amount, amount)
-        )
+        if self._rectangle is None or time.perf_counter() - self._rectangle_timestamp > self.geometry_max_age:
+            return self.refresh_geometry()
+        return self._rectangle
 
     def _failsafe(self):
         """
         Perform the proper failsafe check here (if enabled).
         """
-        if self.get_settings_obj().failsafe:
-            pyautogui.failSafeCheck()
-
-    def _force_stop(self):
-        """
-        Perform the proper force stop check here (if enabled).
-        """
-        if self.force_stop_func(instance=self.instance):
-            self.force_stop_func(instance=self.instance, _set=True)
-            raise StoppedException
+        if self._dispatching():
+            return
+        # Our setting is kept for any checks made on the dispatcher thread,
+        # which never reads any settings itself.
+        self._failsafe_enabled = self.get_settings_obj().failsafe
+        self._failsafe_check()
 
-    def search(self, value):
+    def _failsafe_check(self):
         """
-        Perform a check to see if a specified value is present within the windows text value.
+        Perform the failsafe check here, using the failsafe setting last read by our failsafe (if enabled).
         """
-        if isinstance(value, str):
-            value = [value]
-        else:
-            value = [v for v in value]
-
-        for val in value:
-            # Use "lower" so that we don't deal with casing
-            # issues when searching for possible emulators.
-            if self.text.lower().find(val.lower()) != -1:
-                return True
-
-        return False
+        if self._failsafe_enabled:
+            try:
+                pyautogui.failSafeCheck()
+            except pyautogui.FailSafeException as exc:
+                # Raising our own failsafe exception, so that sessions can handle
+                # it without importing pyautogui (only needed by our win32 windows).
+                raise FailSafeException(str(exc)) from exc
 
     def click(self, point, clicks=1, interval=0.0, button="left", offset=5, pause=0.0):
         """
@@ -195,6 +154,8 @@ class Window(object):
         _point = self._gen_offset(point=point, amount=offset)
         _parameter = win32api.MAKELONG(point[0], point[1] + self.y_padding)
 
+        self._input("click", point=tuple(point), clicks=clicks, button=button)
+
         for _ in range(clicks):
             win32api.SendMessage(self.hwnd, self.ClickEvent[button].value[0], 1, _parameter)
             win32api.SendMessage(self.hwnd, self.ClickEvent[button].value[1], 0, _parameter)
@@ -204,9 +165,81 @@ class Window(object):
         if pause:
             time.sleep(pause)
 
-    def drag(self, start, end, button="left", pause=0.0):
+    def taps(self, points, button="left"):
+        """
+        Perform a sequence of clicks on the window in the background.
+
+        The failsafe and force stop checks only take place once, and every parameter is packed up front.
+        """
+        self._failsafe()
+        self._force_stop()
+
+        points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        _parameters = pack_parameters(points=points, y_padding=self.y_padding)
+
+        self._input("taps", points=points.tolist(), button=button)
+
+        _hwnd, _down, _up = (
+            self.hwnd,
+            self.ClickEvent[button].value[0],
+            self.ClickEvent[button].value[1],
+        )
+        for _parameter in _parameters.tolist():
+            win32api.SendMessage(_hwnd, _down, 1, _parameter)
+            win32api.SendMessage(_hwnd, _up, 0, _parameter)
+
+    def drag(self, start, end, button="left", pause=0.0, duration=None, steps=15, easing="ease_out"):
         """
         Perform a drag on this window in the background.
+
+        When a duration is specified, the drag moves from the start to the end point (in any direction) over that
+        duration, using the number of steps and easing curve specified, otherwise, the drag moves one pixel at a
+        time vertically.
+        """
+        if duration is None:
+            return self._drag_pixels(start=start, end=end, button=button, pause=pause)
+
+        self._failsafe()
+        self._force_stop()
+
+        _y_padding = self.y_padding
+        _parameter_start = win32api.MAKELONG(start[0], start[1] + _y_padding)
+        _parameters = pack_parameters(points=drag_path(start=start, end=end, steps=steps, easing=easing), y_padding=_y_padding)
+
+        self._input("drag", start=tuple(start), end=tuple(end), button=button, duration=duration, steps=steps)
+
+        # Button is DOWN at the starting position after this point, every
+        # step is sent at an even interval throughout the duration.
+        win32api.SendMessage(self.hwnd, self.ClickEvent[button].value[0], 1, _parameter_start)
+        time.sleep(0.05)
+
+        _hwnd, _move, _interval = (
+            self.hwnd,
+            self.Event.MOUSE_MOVE.value,
+            duration / len(_parameters),
+        )
+        _timestamp = time.perf_counter()
+
+        for i, _parameter in enumerate(_parameters.tolist(), start=1):
+            win32api.SendMessage(_hwnd, _move, 1, _parameter)
+            # Sleeping until this step's scheduled time, so the time spent
+            # sending messages is included in our duration.
+            _remaining = _timestamp + _interval * i - time.perf_counter()
+
+            if _remaining > 0:
+                time.sleep(_remaining)
+
+        # Holding still at the end point before letting go, so that
+        # the drag doesn't carry any momentum once released.
+        time.sleep(0.1)
+        win32api.SendMessage(_hwnd, _move, 0, int(_parameters[-1]))
+
+        if pause:
+            time.sleep(pause)
+
+    def _drag_pixels(self, start, end, button="left", pause=0.0):
+        """
+        Perform a drag on this window in the background, moving one pixel at a time vertically.
         """
         self._failsafe()
         self._force_stop()
@@ -214,6 +247,8 @@ class Window(object):
         _parameter_start = win32api.MAKELONG(start[0], start[1] + self.y_padding)
         _parameter_end = win32api.MAKELONG(end[0], end[1] + self.y_padding)
 
+        self._input("drag", start=tuple(start), end=tuple(end), button=button)
+
         # Moving the mouse to the starting position for the duration of our
         # mouse dragging, button is DOWN after this point.
         win32api.SendMessage(self.hwnd, self.ClickEvent[button].value[0], 1, _parameter_start)
@@ -245,100 +280,252 @@ class Window(object):
         Loops can be specified to determine how many circles should be dragged, the scale
         amount is used to shrink or grow the circle with each subsequent loop.
         """
-        self._failsafe()
-        self._force_stop()
-        # Grab our initial point.
-        # This is hardcoded since we always expect
-        # our window to be the correct size.
+        self._interrupt()
+        # Grab our initial point, just below the middle of the emulator,
+        # (240, 440) at our base size, kept relative to the emulator size.
         x, y = (
-            int(self.emulator_width / 2),
-            int(self.emulator_height / 2 + 40),
+            int(self.emulator_width * 0.5),
+            int(self.emulator_height * 0.55),
         )
 
-        _parameter_initial = win32api.MAKELONG(x, y + self.y_padding)
-        _parameter = None
+        _y_padding = self.y_padding
+        _parameter_initial = win32api.MAKELONG(x, y + _y_padding)
+
+        # The entire path is packed up front, the circles themselves are cached
+        # and only the random offsets are generated for each drag.
+        path = circle_path(center=(x, y), radius=radius, loops=loops, scale=scale)
+        path = path + np.random.randint(-offset, offset + 1, size=path.shape, dtype=np.int32) if offset else path
+        _parameters = pack_parameters(points=path, y_padding=_y_padding).reshape(loops, -1).tolist()
+
+        self._input("drag_circle", radius=radius, loops=loops, scale=scale, button=button)
 
         # Move the mouse to our starting position for the duration
         # of mouse dragging, the button is DOWN after this point.
         win32api.SendMessage(self.hwnd, self.ClickEvent[button].value[0], 1, _parameter_initial)
 
-        for loop in range(loops):
+        _hwnd, _move, _down = (
+            self.hwnd,
+            self.Event.MOUSE_MOVE.value,
+            self.ClickEvent[button].value[0],
+        )
+        for loop, _loop_parameters in enumerate(_parameters):
             if loop != 0:
-                # Grow/shrink our radius for each subsequent loop after
-                # the initial drag.
-                radius = radius * scale
-
-            for i in range(360):
-                if i % 3 == 0:
-                    continue
-                if i % 100 == 0:
-                    self._failsafe()
-                    self._force_stop()
-                _parameter = win32api.MAKELONG(
-                    int(x + radius * math.cos(math.radians(i))) + random.randint(-offset, offset),
-                    int(y + radius * math.sin(math.radians(i))) + random.randint(-offset, offset),
-                )
-                win32api.SendMessage(self.hwnd, self.Event.MOUSE_MOVE.value, 1, _parameter)
-                time.sleep(interval)
+                # Failsafe and force stop checks take place before each circle (never
+                # in the middle of one), on the dispatcher thread as well.
+                self._interrupt()
+
+            for _parameter in _loop_parameters:
+                win32api.SendMessage(_hwnd, _move, 1, _parameter)
+
+                if interval:
+                    time.sleep(interval)
 
             # Ensure we emulate the action of letting go of the mouse.
             # Since we've been dragging this entire time.
-            win32api.SendMessage(self.hwnd, self.Event.MOUSE_MOVE.value, 0, _parameter)
-            win32api.SendMessage(self.hwnd, self.ClickEvent[button].value[0], 0, _parameter)
+            win32api.SendMessage(_hwnd, _move, 0, _loop_parameters[-1])
+            win32api.SendMessage(_hwnd, _down, 0, _loop_parameters[-1])
 
         if pause:
             time.sleep(pause)
 
-    def screenshot(self, region=None):
+    @contextmanager
+    def _screenshot_lock(self):
         """
-        Perform a screenshot on this window or region within, ignoring any windows in front of the window.
+        Hold the screenshot lock for this window, tracking any time spent waiting on it.
         """
-        with _screenshot_lock:
-            hwnd_dc = win32gui.GetWindowDC(self.hwnd)
-            mfc_dc = win32ui.CreateDCFromHandle(hwnd_dc)
-            save_dc = mfc_dc.CreateCompatibleDC()
-
-            save_bitmap = win32ui.CreateBitmap()
-            save_bitmap.CreateCompatibleBitmap(mfc_dc, self.width, self.height)
+        timestamp = time.perf_counter()
 
-            save_dc.SelectObject(save_bitmap)
+        with get_screenshot_lock(hwnd=self.hwnd):
+            self.screenshot_lock_wait += time.perf_counter() - timestamp
+            yield
 
-            # Store the actual screenshot result here through
-            # the use of the windll object.
-            windll.user32.PrintWindow(self.hwnd, save_dc.GetSafeHdc(), 0)
+    def release(self):
+        """
+        Release any capture resources currently held by this window.
+        """
+        with self._screenshot_lock():
+            if self._capture:
+                self._capture.release()
+                self._capture = None
 
-            bmp_info = save_bitmap.GetInfo()
-            bmp_str = save_bitmap.GetBitmapBits(True)
+    def screenshot(self, region=None, refresh=True):
+        """
+        Perform a screenshot on this window or region within, ignoring any windows in front of the window.
 
-            # Store the actual Image object retrieved from our windows calls
-            # in this variable.
-            image = Image.frombuffer("RGB", (bmp_info["bmWidth"], bmp_info["bmHeight"]), bmp_str, "raw", "BGRX", 0, 1)
+        If refresh is disabled, the last capture taken is re-read instead of capturing the window again.
+        """
+        with self._screenshot_lock():
+            # Each new capture refreshes our geometry (regardless of its max age), a
+            # resized window is picked up here and our capture context is rebuilt, this
+            # is a single GetWindowRect call, negligible next to the capture itself.
+            if refresh:
+                self.refresh_geometry()
 
-            # Cleanup any dc objects that are currently in use.
-            # This also makes sure when we come back, nothing is in use.
-            save_dc.DeleteDC()
-            mfc_dc.DeleteDC()
+            width, height = (
+                self.width,
+                self.height,
+            )
+            padding = height - self.emulator_height
+
+            if not self._capture:
+                self._capture = WindowCapture(hwnd=self.hwnd)
+            # Our capture context is only rebuilt when the window size
+            # has changed since the last capture took place, a rebuilt
+            # context has nothing to re-read, so we always capture.
+            if self._capture.prepare(width=width, height=height):
+                refresh = True
+            if refresh:
+                self._capture.capture()
+
+            # If a region has been specified (and falls within our window), only the region
+            # is copied out of our capture, with our y padding offset applied to it.
+            if region and (
+                0 <= region[0] < region[2] <= width
+                and 0 <= region[1] < region[3] <= height - padding
+            ):
+                return Frame.from_buffer(
+                    buffer=self._capture.bits(box=(
+                        region[0],
+                        region[1] + padding,
+                        region[2],
+                        region[3] + padding,
+                    )),
+                    width=region[2] - region[0],
+                    height=region[3] - region[1],
+                )
 
-            win32gui.ReleaseDC(self.hwnd, hwnd_dc)
-            win32gui.DeleteObject(save_bitmap.GetHandle())
+            # Store the actual Frame object retrieved from our windows calls
+            # in this variable.
+            frame = Frame.from_buffer(buffer=self._capture.bits(), width=width, height=height)
 
             # Ensure we also remove any un-needed image data, we only
             # want the in game screen, which should be the proper emulator height and width.
-            image = image.crop(box=(
+            frame = frame.crop(box=(
                 0,
-                self.y_padding,
-                self.width,
-                self.height,
+                padding,
+                width,
+                height,
             ))
 
-            # If a region has been specified as well, we should crop the image to meet our
+            # If a region has been specified as well, we should crop the frame to meet our
             # region bbox specified, regions should already take into account our expected y padding.
             if region:
-                image = image.crop(box=region)
+                frame = frame.crop(box=region)
+
+            # Frame has been collected, parsed, and cropped.
+            # Return the frame now, exiting will release our lock.
+            return frame
+
+
+class WindowCapture(object):
+    """
+    Window capture objects hold on to the device contexts and bitmap used to capture a window, these
+    are reused between screenshots and only rebuilt when the window size changes.
+    """
+    def __init__(
+        self,
+        hwnd,
+    ):
+        """
+        Initialize a new (empty) capture context for the specified hwnd value.
+        """
+        self.hwnd = hwnd
+        self.width = None
+        self.height = None
 
-            # Image has been collected, parsed, and cropped.
-            # Return the image now, exiting will release our lock.
-            return image
+        self.hwnd_dc = None
+        self.mfc_dc = None
+        self.save_dc = None
+        self.save_bitmap = None
+        # Region contexts are stored by their (width, height), each one
+        # contains a dc and bitmap that regions can be copied into.
+        self.regions = {}
+
+    def prepare(self, width, height):
+        """
+        Ensure the capture context is available and matches the specified size.
+
+        True is returned if the context had to be (re)built.
+        """
+        if self.save_bitmap and (self.width, self.height) == (width, height):
+            return False
+        # Context is missing or our window has been resized, cleanup
+        # anything that might still be in use before rebuilding.
+        self.release()
+
+        self.hwnd_dc = win32gui.GetWindowDC(self.hwnd)
+        self.mfc_dc = win32ui.CreateDCFromHandle(self.hwnd_dc)
+        self.save_dc = self.mfc_dc.CreateCompatibleDC()
+
+        self.save_bitmap = win32ui.CreateBitmap()
+        self.save_bitmap.CreateCompatibleBitmap(self.mfc_dc, width, height)
+
+        self.save_dc.SelectObject(self.save_bitmap)
+
+        self.width = width
+        self.height = height
+
+        return True
+
+    def capture(self):
+        """
+        Capture the window into our bitmap.
+        """
+        # Store the actual screenshot result here through
+        # the use of the windll object.
+        windll.user32.PrintWindow(self.hwnd, self.save_dc.GetSafeHdc(), 0)
+
+    def bits(self, box=None):
+        """
+        Retrieve the raw (BGRX) bitmap bits of the last capture, or the box specified within it.
+        """
+        if not box:
+            return self.save_bitmap.GetBitmapBits(True)
+
+        width, height = (
+            box[2] - box[0],
+            box[3] - box[1],
+        )
+        if (width, height) not in self.regions:
+            region_dc = self.mfc_dc.CreateCompatibleDC()
+            region_bitmap = win32ui.CreateBitmap()
+            region_bitmap.CreateCompatibleBitmap(self.mfc_dc, width, height)
+            region_dc.SelectObject(region_bitmap)
+
+            self.regions[(width, height)] = (
+                region_dc,
+                region_bitmap,
+            )
+        region_dc, region_bitmap = self.regions[(width, height)]
+
+        # Copying only the box requested into our right-sized bitmap,
+        # the bits read back are only as large as the box itself.
+        region_dc.BitBlt((0, 0), (width, height), self.save_dc, (box[0], box[1]), win32con.SRCCOPY)
+
+        return region_bitmap.GetBitmapBits(True)
+
+    def release(self):
+        """
+        Cleanup any dc objects and bitmaps that are currently in use.
+        """
+        for region_dc, region_bitmap in self.regions.values():
+            region_dc.DeleteDC()
+            win32gui.DeleteObject(region_bitmap.GetHandle())
+
+        if self.save_dc:
+            self.save_dc.DeleteDC()
+        if self.mfc_dc:
+            self.mfc_dc.DeleteDC()
+        if self.hwnd_dc:
+            win32gui.ReleaseDC(self.hwnd, self.hwnd_dc)
+        if self.save_bitmap:
+            win32gui.DeleteObject(self.save_bitmap.GetHandle())
+
+        self.hwnd_dc = None
+        self.mfc_dc = None
+        self.save_dc = None
+        self.save_bitmap = None
+        self.regions = {}
 
 
 class WindowHandler(object):
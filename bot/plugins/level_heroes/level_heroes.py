@@ -3,6 +3,8 @@ from bot.plugins.plugin import (
     BotPlugin,
 )
 
+from itertools import compress
+
 import time
 
 
@@ -74,26 +76,31 @@ class LevelHeroes(BotPlugin):
             not self.bot.configuration.level_heroes_masteries_unlocked
         ) else 1
 
-        for point in self.bot.configurations["points"]["level_heroes"]["possible_hero_level_points"]:
-            # Looping through possible clicks so we can check if we should level, if not, we can early
-            # break and move to the next point.
-            for i in range(clicks):
-                # Only ever actually clicking on the hero if we know for sure a "level" is available.
-                # We do this by checking the color of the point.
-                if not self.bot.point_is_color_range(
-                    point=(
-                        point[0] + self.bot.configurations["parameters"]["level_heroes"]["check_possible_point_x_padding"],
-                        point[1],
-                    ),
-                    color_range=self.bot.configurations["colors"]["level_heroes"]["level_heroes_click_range"],
-                ):
-                    self.bot.click(
-                        point=point,
-                        interval=self.bot.configurations["parameters"]["level_heroes"]["hero_level_clicks_interval"],
-                        pause=self.bot.configurations["parameters"]["level_heroes"]["hero_level_clicks_pause"],
-                    )
-                else:
-                    break
+        points = self.bot.configurations["points"]["level_heroes"]["possible_hero_level_points"]
+        probes = [
+            (
+                (point[0] + self.bot.configurations["parameters"]["level_heroes"]["check_possible_point_x_padding"], point[1]),
+                self.bot.configurations["colors"]["level_heroes"]["level_heroes_click_range"],
+            )
+            for point in points
+        ]
+        remaining = list(range(len(points)))
+
+        for i in range(clicks):
+            # Only ever actually clicking on the heroes we know for sure have a "level" available, every
+            # remaining hero is probed using a single frame after each batch of clicks, heroes that can't
+            # be levelled anymore are skipped without checking them again.
+            remaining = list(compress(remaining, ~self.bot.probe(
+                probes=[probes[index] for index in remaining],
+            )))
+            if not remaining:
+                break
+            for index in remaining:
+                self.bot.click(
+                    point=points[index],
+                    interval=self.bot.configurations["parameters"]["level_heroes"]["hero_level_clicks_interval"],
+                    pause=self.bot.configurations["parameters"]["level_heroes"]["hero_level_clicks_pause"],
+                )
         # Perform an additional sleep once levelling is totally
         # complete, this helps avoid issues with clicks causing
         # a hero detail sheet to pop up.
@@ -103,13 +110,15 @@ class LevelHeroes(BotPlugin):
         """Perform a check to determine if the autobuy functionality is currently enabled for this session and in game.
         """
         if self.bot.configuration.level_heroes_skip_if_autobuy_enabled:
+            point = self.bot.configurations["points"]["level_heroes"]["level_heroes_autobuy_color_check"]
             # First thing here, turn on autobuy if it's currently off.
             # If this is the case, we can also just return early since we
             # know that it's on.
-            if self.bot.point_is_color_range(
-                point=self.bot.configurations["points"]["level_heroes"]["level_heroes_autobuy_color_check"],
-                color_range=self.bot.configurations["colors"]["level_heroes"]["level_heroes_autobuy_disabled_range"],
-            ):
+            if self.bot.probe(
+                probes=[
+                    (point, self.bot.configurations["colors"]["level_heroes"]["level_heroes_autobuy_disabled_range"]),
+                ],
+            )[0]:
                 # Enable autobuy at this point.
                 # (If the user does not have the required perk on, we can chalk it up to
                 # a part of the configuration process, since there isn't much we can do at this point
@@ -124,16 +133,12 @@ class LevelHeroes(BotPlugin):
             # We'll now check for the proper red/blue arrows being present, these being available
             # means that the autobuy functionality is enabled and running.
             for i in range(self.bot.configurations["parameters"]["level_heroes"]["level_heroes_autobuy_check_range"]):
-                if (
-                    self.bot.point_is_color_range(
-                        point=self.bot.configurations["points"]["level_heroes"]["level_heroes_autobuy_color_check"],
-                        color_range=self.bot.configurations["colors"]["level_heroes"]["level_heroes_autobuy_enabled_red_range"],
-                    )
-                    or self.bot.point_is_color_range(
-                        point=self.bot.configurations["points"]["level_heroes"]["level_heroes_autobuy_color_check"],
-                        color_range=self.bot.configurations["colors"]["level_heroes"]["level_heroes_autobuy_enabled_blue_range"],
-                    )
-                ):
+                if self.bot.probe(
+                    probes=[
+                        (point, self.bot.configurations["colors"]["level_heroes"]["level_heroes_autobuy_enabled_red_range"]),
+                        (point, self.bot.configurations["colors"]["level_heroes"]["level_heroes_autobuy_enabled_blue_range"]),
+                    ],
+                ).any():
                     autobuy = True
                     break
                 # Sleeping no matter what here unless we break above to try and weed
@@ -147,10 +152,12 @@ class LevelHeroes(BotPlugin):
         """
         self.bot.travel_to_heroes(collapsed=False)
 
-        while self.bot.point_is_color_range(
-            point=self.bot.configurations["points"]["headgear_swap"]["skill_upgrade_wait"],
-            color_range=self.bot.configurations["colors"]["headgear_swap"]["skill_upgrade_wait_range"]
-        ):
+        while self.bot.probe(
+            probes=[(
+                self.bot.configurations["points"]["headgear_swap"]["skill_upgrade_wait"],
+                self.bot.configurations["colors"]["headgear_swap"]["skill_upgrade_wait_range"],
+            )],
+        )[0]:
             # Sleep slightly before checking again that the skill
             # notification has disappeared.
             time.sleep(self.bot.configurations["parameters"]["headgear_swap"]["headgear_swap_wait_pause"])
@@ -197,10 +204,12 @@ class LevelHeroes(BotPlugin):
         timeout_headgear_panel_click_max = self.bot.configurations["parameters"]["headgear_swap"]["timeout_headgear_panel_click"]
 
         try:
-            while not self.bot.point_is_color_range(
-                point=self.bot.configurations["points"]["headgear_swap"]["headgear_panel_color_check"],
-                color_range=self.bot.configurations["colors"]["headgear_swap"]["headgear_panel_range"],
-            ):
+            while not self.bot.probe(
+                probes=[(
+                    self.bot.configurations["points"]["headgear_swap"]["headgear_panel_color_check"],
+                    self.bot.configurations["colors"]["headgear_swap"]["headgear_panel_range"],
+                )],
+            )[0]:
                 self.bot.click(
                     point=self.bot.configurations["points"]["headgear_swap"]["headgear_panel"],
                     pause=self.bot.configurations["parameters"]["headgear_swap"]["headgear_panel_pause"],
@@ -327,22 +327,27 @@ class Prestige(BotPlugin):
             self.logger.info(
                 "Tournaments are enabled, checking current status of in game tournament..."
             )
+            # Every tournament status is probed at once, using a single frame.
+            soon, ready, over = self.bot.probe(
+                probes=[
+                    (
+                        self.bot.configurations["points"]["tournaments"]["tournaments_status"],
+                        self.bot.configurations["colors"]["tournaments"]["tournaments_%(status)s_range" % {
+                            "status": status,
+                        }],
+                    ) for status in ["soon", "ready", "over"]
+                ],
+            )
             # Tournament is in a "grey" state, one will be starting soon...
             # We do nothing here.
-            if self.bot.point_is_color_range(
-                point=self.bot.configurations["points"]["tournaments"]["tournaments_status"],
-                color_range=self.bot.configurations["colors"]["tournaments"]["tournaments_soon_range"],
-            ):
+            if soon:
                 # Tournament is not ready yet at all. Doing nothing for tournament functionality.
                 self.logger.info(
                     "Tournament is starting soon, skipping tournament functionality until ready..."
                 )
             # Tournament is in a "blue" state, one is ready and can
             # be joined now, we join the tournament here.
-            elif self.bot.point_is_color_range(
-                point=self.bot.configurations["points"]["tournaments"]["tournaments_status"],
-                color_range=self.bot.configurations["colors"]["tournaments"]["tournaments_ready_range"],
-            ):
+            elif ready:
                 tournament_prestige = True
                 # Tournament is available and ready to be joined... Attempting to join and skip
                 # prestige functionality below.
@@ -383,10 +388,7 @@ class Prestige(BotPlugin):
                     )
             # Tournament is in a "red" state, one we joined is now
             # over and rewards are available.
-            elif self.bot.point_is_color_range(
-                point=self.bot.configurations["points"]["tournaments"]["tournaments_status"],
-                color_range=self.bot.configurations["colors"]["tournaments"]["tournaments_over_range"],
-            ):
+            elif over:
                 self.bot.click(
                     point=self.bot.configurations["points"]["tournaments"]["tournaments_icon"],
                     pause=self.bot.configurations["parameters"]["tournaments"]["icon_pause"],
@@ -493,7 +495,8 @@ class Prestige(BotPlugin):
             "activate_skills",
             "level_heroes",
         ]:
-            self.bot.plugins[run_after].execute(
+            self.bot.execute_plugin(
+                plugin=run_after,
                 force=self.bot.plugins[run_after].force_on_start,
             )
         # Reset schedule data post prestige.
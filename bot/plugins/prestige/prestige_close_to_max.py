@@ -50,7 +50,7 @@ class PrestigeCloseToMax(Prestige):
                 interval=interval,
             )
         else:
-            self.bot.plugins["prestige"].execute()
+            self.bot.execute_plugin(plugin="prestige")
 
     def execute(self, force=False):
         """
@@ -140,7 +140,7 @@ class PrestigeCloseToMax(Prestige):
                     self.logger.info(
                         "Fight boss icon is present, prestige is ready..."
                     )
-                    self.bot.plugins["prestige"].execute()
+                    self.bot.execute_plugin(plugin="prestige")
             else:
                 self.logger.info(
                     "Prestige is ready..."
@@ -2,6 +2,11 @@ from bot.plugins.plugin import (
     register_plugin,
     BotPlugin,
 )
+from bot.core.query import (
+    ScreenQuery,
+    TemplatePredicate,
+    ColorPredicate,
+)
 
 
 class ShopVideoChest(BotPlugin):
@@ -13,6 +18,40 @@ class ShopVideoChest(BotPlugin):
     plugin_interval_reset = False
     plugin_execute_on_start = "shop_video_chest_on_start"
 
+    def __init__(self, bot, logger):
+        super().__init__(bot=bot, logger=logger)
+
+        # Our screen queries are compiled on first use, once any
+        # session scaling has been applied to our configurations.
+        self.video_chest_query = None
+        self.collect_query = None
+
+    def _compile_queries(self):
+        """Compile the screen queries used by the plugin.
+        """
+        self.video_chest_query = ScreenQuery(
+            mode="all",
+            watch_video_header=TemplatePredicate(
+                image=self.bot.files["shop_watch_video_header"],
+                precision=self.bot.configurations["parameters"]["shop_video_chest"]["watch_video_precision"],
+            ),
+            diamonds_header=TemplatePredicate(
+                image=self.bot.files["shop_diamonds_header"],
+                precision=self.bot.configurations["parameters"]["shop_video_chest"]["diamonds_precision"],
+            ),
+        )
+        self.collect_query = ScreenQuery(
+            mode="all",
+            collect=TemplatePredicate(
+                image=self.bot.files["shop_collect_video_icon"],
+                precision=self.bot.configurations["parameters"]["shop_video_chest"]["collect_video_icon_precision"],
+            ),
+            collect_disabled=ColorPredicate(
+                point=self.bot.configurations["points"]["shop_video_chest"]["collect_color_point"],
+                color_range=self.bot.configurations["colors"]["shop_video_chest"]["collect_disabled_range"],
+            ),
+        )
+
     def _shop_ensure_prompts_closed(self):
         """Ensure any prompts or panels open in the shop panel are closed.
 
@@ -26,6 +65,9 @@ class ShopVideoChest(BotPlugin):
         )
 
     def execute(self, force=False):
+        if not self.video_chest_query:
+            self._compile_queries()
+
         self.bot.travel_to_shop(
             stop_image_kwargs={
                 "image": self.bot.files["shop_watch_video_header"],
@@ -40,15 +82,8 @@ class ShopVideoChest(BotPlugin):
         timeout_shop_video_chest_max = self.bot.configurations["parameters"]["shop_video_chest"]["timeout_search_watch_video"]
 
         try:
-            while not (
-                self.bot.search(
-                    image=self.bot.files["shop_watch_video_header"],
-                    precision=self.bot.configurations["parameters"]["shop_video_chest"]["watch_video_precision"],
-                )[0] and
-                self.bot.search(
-                    image=self.bot.files["shop_diamonds_header"],
-                    precision=self.bot.configurations["parameters"]["shop_video_chest"]["diamonds_precision"],
-                )[0]
+            while not self.bot.query(
+                query=self.video_chest_query,
             ):
                 # Looping until both the watch video header and diamonds header
                 # are present, since at that point, video chest is on the screen to search.
@@ -82,37 +117,33 @@ class ShopVideoChest(BotPlugin):
                 point=collect_position,
                 pause=self.bot.configurations["parameters"]["shop_video_chest"]["collect_pause"],
             )
-            if not self.bot.point_is_color_range(
-                    point=self.bot.configurations["points"]["shop_video_chest"]["collect_color_point"],
-                    color_range=self.bot.configurations["colors"]["shop_video_chest"]["collect_disabled_range"],
-            ):
-                collect_found, collect_position, collect_image = self.bot.search(
-                    image=self.bot.files["shop_collect_video_icon"],
-                    precision=self.bot.configurations["parameters"]["shop_video_chest"]["collect_video_icon_precision"],
-                )
+            # The collect icon and its disabled state are both
+            # checked using a single frame here.
+            collect = self.bot.query(
+                query=self.collect_query,
+            )
+            if not collect["collect_disabled"]:
+                collect_found, collect_position = collect["collect"]
+
                 if collect_found:
                     # Only trying to collect if the collection button isn't in
-                    # a disabled state...
-                    if not self.bot.point_is_color_range(
-                        point=self.bot.configurations["points"]["shop_video_chest"]["collect_color_point"],
-                        color_range=self.bot.configurations["colors"]["shop_video_chest"]["collect_disabled_range"],
-                    ):
-                        self.logger.info(
-                            "Video chest collection is available, collecting now..."
-                        )
-                        # Collection happens here.
-                        self.bot.click(
-                            point=self.bot.configurations["points"]["shop_video_chest"]["collect_point"],
-                            pause=self.bot.configurations["parameters"]["shop_video_chest"]["collect_point_pause"],
-                        )
-                        # After collecting the chest, we will click on the middle of the screen
-                        # TWICE, we don't want to accidentally click on anything in the shop.
-                        self.bot.click(
-                            point=self.bot.configurations["points"]["main_screen"]["top_middle"],
-                            clicks=self.bot.configurations["parameters"]["shop"]["post_purchase_clicks"],
-                            interval=self.bot.configurations["parameters"]["shop"]["post_purchase_interval"],
-                            pause=self.bot.configurations["parameters"]["shop"]["post_purchase_pause"],
-                        )
+                    # a disabled state, checked above using the same frame...
+                    self.logger.info(
+                        "Video chest collection is available, collecting now..."
+                    )
+                    # Collection happens here.
+                    self.bot.click(
+                        point=self.bot.configurations["points"]["shop_video_chest"]["collect_point"],
+                        pause=self.bot.configurations["parameters"]["shop_video_chest"]["collect_point_pause"],
+                    )
+                    # After collecting the chest, we will click on the middle of the screen
+                    # TWICE, we don't want to accidentally click on anything in the shop.
+                    self.bot.click(
+                        point=self.bot.configurations["points"]["main_screen"]["top_middle"],
+                        clicks=self.bot.configurations["parameters"]["shop"]["post_purchase_clicks"],
+                        interval=self.bot.configurations["parameters"]["shop"]["post_purchase_interval"],
+                        pause=self.bot.configurations["parameters"]["shop"]["post_purchase_pause"],
+                    )
                 watch_found, watch_position, watch_image = self.bot.search(
                     image=self.bot.files["shop_watch_video_icon"],
                     precision=self.bot.configurations["parameters"]["shop_video_chest"]["watch_video_icon_precision"],
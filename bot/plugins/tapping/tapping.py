@@ -2,9 +2,8 @@ from bot.plugins.plugin import (
     register_plugin,
     BotPlugin,
 )
+from bot.core.taps import TapSchedule
 
-import copy
-import random
 import time
 
 
@@ -115,32 +114,10 @@ class Tapping(BotPlugin):
             self.logger.info(
                 "Tapping..."
             )
-        tap = []
-        maps = [
-            "fairies",
-            "heroes",
-            "pet",
-            "master",
-        ]
-        for key in maps:
-            if key == "heroes":
-                lst = copy.copy(self.bot.configurations["points"]["tap"]["tap_map"][key])
-                for i in range(self.bot.configurations["parameters"]["tap"]["tap_heroes_loops"]):
-                    # The "heroes" key will shuffle and reuse the map, this aids in the process
-                    # of activating the astral awakening skills.
-                    random.shuffle(lst)
-                    # After a shuffle, we'll also remove some tap points if they dont surpass a certain
-                    # percent threshold configured in the backend.
-                    lst = [
-                        point for point in lst if
-                        random.random() > self.bot.configurations["parameters"]["tap"]["tap_heroes_remove_percent"]
-                    ]
-                    tap.extend(lst)
-            else:
-                tap.extend(self.bot.configurations["points"]["tap"]["tap_map"][key])
-
         # Remove any points that could open up the
         # one time offer prompt.
+        prevent_region = None
+
         if self.bot.search(
             image=self.bot.files["one_time_offer"],
             region=self.bot.configurations["regions"]["tap"]["one_time_offer_area"],
@@ -148,13 +125,25 @@ class Tapping(BotPlugin):
         )[0]:
             # A one time offer is on the screen, we'll filter out any tap points that fall
             # within this point, this prevents us from buying anything in the store.
-            tap = [point for point in tap if not self.bot.point_is_region(
-                point=point,
-                region=self.bot.configurations["regions"]["tap"]["one_time_offer_prevent_area"],
-            )]
+            prevent_region = self.bot.configurations["regions"]["tap"]["one_time_offer_prevent_area"]
 
-        for index, point in enumerate(tap):
-            if index % self.bot.configurations["parameters"]["tap"]["tap_fairies_modulo"] == 0:
+        # The entire tap sequence (and its offsets) is compiled up front, taps are
+        # then sent in segments, the checkpoints run in between each segment.
+        schedule = TapSchedule.compile(
+            tap_map=self.bot.configurations["points"]["tap"]["tap_map"],
+            heroes_loops=self.bot.configurations["parameters"]["tap"]["tap_heroes_loops"],
+            heroes_remove_percent=self.bot.configurations["parameters"]["tap"]["tap_heroes_remove_percent"],
+            offset_min=self.bot.configurations["parameters"]["tap"]["offset_min"],
+            offset_max=self.bot.configurations["parameters"]["tap"]["offset_max"],
+            prevent_region=prevent_region,
+            checkpoints={
+                "fairies": self.bot.configurations["parameters"]["tap"]["tap_fairies_modulo"],
+                "collapse": self.bot.configurations["parameters"]["tap"]["tap_collapse_prompts_modulo"],
+            },
+        )
+
+        for checkpoints, segment in schedule.segments():
+            if "fairies" in checkpoints:
                 # Also handle the fact that fairies could appear
                 # and be clicked on while tapping is taking place.
                 self.fairies()
@@ -162,7 +151,7 @@ class Tapping(BotPlugin):
                     self.logger.info(
                         "Tapping..."
                     )
-            if index % self.bot.configurations["parameters"]["tap"]["tap_collapse_prompts_modulo"] == 0:
+            if "collapse" in checkpoints:
                 # Also handle the fact the tapping in general is sporadic
                 # and the incorrect panel/window could be open.
                 try:
@@ -170,16 +159,16 @@ class Tapping(BotPlugin):
                     self.bot.collapse_event_panel()
                 except TimeoutError:
                     # This might be a one off issue, in which case, just continue even though
-                    # we aren't able to collapse.
-                    continue
-            self.bot.click(
-                point=point,
-                button=self.bot.configurations["parameters"]["tap"]["button"],
-                offset=random.randint(
-                    self.bot.configurations["parameters"]["tap"]["offset_min"],
-                    self.bot.configurations["parameters"]["tap"]["offset_max"],
-                ),
-            )
+                    # we aren't able to collapse (skipping this checkpoint's tap).
+                    segment = segment[1:]
+            if len(segment):
+                self.bot.taps(
+                    points=segment,
+                    button=self.bot.configurations["parameters"]["tap"]["button"],
+                )
+        # Taps are queued while our checkpoints run, waiting for every
+        # tap to be sent before pausing and checking for fairies.
+        self.bot.flush()
         # Only pausing after all clicks have been performed.
         time.sleep(self.bot.configurations["parameters"]["tap"]["pause"])
         # Additionally, perform a final fairy check explicitly
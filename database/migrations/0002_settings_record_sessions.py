@@ -0,0 +1,18 @@
+# Generated by Django 3.2.4 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('database', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='settings',
+            name='record_sessions',
+            field=models.BooleanField(default=False, help_text='Enable/disable the functionality that records every captured frame, input and active plugin into a session\narchive in your local data directory. This setting is only applied on session startup. Recordings can grow large,\nthis should only be enabled while debugging a misbehaving session. Defaults to "False".', verbose_name='Record Sessions'),
+        ),
+    ]
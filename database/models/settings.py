@@ -28,6 +28,7 @@ class Settings(Model):
         "ad_blocking",
         "log_level",
         "log_purge_days",
+        "record_sessions",
     ]
 
     log_level_choices = (
@@ -78,6 +79,15 @@ class Settings(Model):
             "the number of days specified here. Defaults to \"3\"."
         ),
     )
+    record_sessions = BooleanField(
+        default=False,
+        verbose_name="Record Sessions",
+        help_text=(
+            "Enable/disable the functionality that records every captured frame, input and active plugin into a session\n"
+            "archive in your local data directory. This setting is only applied on session startup. Recordings can grow large,\n"
+            "this should only be enabled while debugging a misbehaving session. Defaults to \"False\"."
+        ),
+    )
     # Unconfigurable settings. These are handled implicitly by the application
     # and we do not need to expose these to the gui for modification by the user.
     console_size = CharField(
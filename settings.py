@@ -52,3 +52,8 @@ DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 # Any local logs should be stored in this directory.
 # This is also passed into our gui functionality where needed.
 LOCAL_DATA_LOGS_DIRECTORY = os.path.join(LOCAL_DATA_DIRECTORY, "logs")
+# Any local session recordings should be stored in this directory.
+LOCAL_DATA_RECORDINGS_DIRECTORY = os.path.join(LOCAL_DATA_DIRECTORY, "recordings")
+# Screen signatures used to classify the current game screen are stored in this file,
+# signatures are generated from a labelled replay set (see bot.core.screens).
+LOCAL_DATA_SCREENS_FILE = os.path.join(LOCAL_DATA_DIRECTORY, "screens.npz")
@@ -0,0 +1,201 @@
+"""
+Shared test fixtures, bot sessions are built on replay sources so that they run on any platform.
+"""
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import importlib
+import pytest
+import ctypes
+import types
+import cv2
+import sys
+import os
+
+import bot.core.bot
+
+from bot.core.source import ReplaySource
+
+
+EMULATOR_WIDTH = 480
+EMULATOR_HEIGHT = 800
+
+
+class Configuration(SimpleNamespace):
+    """
+    Stand-in for a local bot configuration, every setting not specified is disabled.
+    """
+    def __getattr__(self, name):
+        return False
+
+
+@pytest.fixture
+def replay_frames(tmp_path):
+    """
+    Retrieve a function that generates a replay from the frames specified, each frame is a dictionary
+    of the templates (by name) it contains, and the (x, y) position each template is pasted at.
+    """
+    def build(frames, name="frames"):
+        directory = tmp_path / name
+        directory.mkdir()
+
+        for index, templates in enumerate(frames):
+            frame = np.full((800, 480, 3), 32, dtype=np.uint8)
+
+            for template, (x, y) in templates.items():
+                template = cv2.imread(os.path.join(bot.core.bot.BOT_DATA_IMAGES_DIRECTORY, "%s.png" % template))
+                frame[y:y + template.shape[0], x:x + template.shape[1]] = template
+            cv2.imwrite(str(directory / ("%04d.png" % index)), frame)
+        return ReplaySource(path=str(directory))
+    return build
+
+
+@pytest.fixture
+def session(tmp_path, monkeypatch):
+    """
+    Retrieve a function that builds a fully configured bot session on the replay source specified.
+    """
+    monkeypatch.setattr(bot.core.bot, "LOCAL_DATA_LOGS_DIRECTORY", str(tmp_path))
+
+    def build(replay, events=None):
+        events = events if events is not None else []
+
+        return bot.core.bot.Bot(
+            application_name="Tap Titans Bot",
+            application_version="0.0.0",
+            event=SimpleNamespace(objects=SimpleNamespace(create=lambda **kwargs: events.append(kwargs))),
+            instance=1,
+            instance_obj=None,
+            instance_name="Replay",
+            instance_func=lambda: 1,
+            window=replay,
+            configuration=Configuration(
+                name="Replay",
+                activate_skills_heavenly_strike=(0,),
+                activate_skills_deadly_strike=(0,),
+                activate_skills_hand_of_midas=(0,),
+                activate_skills_fire_sword=(0,),
+                activate_skills_war_cry=(0,),
+                activate_skills_shadow_clone=(0,),
+                artifacts_upgrade_artifacts=[],
+            ),
+            session="replay",
+            get_settings_obj=lambda: SimpleNamespace(
+                failsafe=True,
+                ad_blocking=False,
+                log_level="INFO",
+                record_sessions=False,
+            ),
+            force_prestige_func=lambda instance, _set=False: False,
+            force_stop_func=lambda instance, _set=False: False,
+            # Stopping right away, the session is only started so that
+            # it's fully configured (and torn down) against our replay.
+            stop_func=lambda instance: True,
+            pause_func=lambda instance: False,
+        )
+    return build
+
+
+class StubBitmap(object):
+    def __init__(self):
+        self.array = None
+
+    def CreateCompatibleBitmap(self, dc, width, height):
+        self.array = np.zeros((height, width, 4), dtype=np.uint8)
+
+    def GetBitmapBits(self, as_string):
+        return self.array.tobytes()
+
+    def GetHandle(self):
+        return id(self)
+
+
+class StubDC(object):
+    def __init__(self):
+        self.bitmap = None
+
+    def CreateCompatibleDC(self):
+        return StubDC()
+
+    def SelectObject(self, bitmap):
+        self.bitmap = bitmap
+
+    def GetSafeHdc(self):
+        return self
+
+    def BitBlt(self, destination, size, source, origin, operation):
+        (x, y), (width, height) = origin, size
+        self.bitmap.array[destination[1]:destination[1] + height, destination[0]:destination[0] + width] = (
+            source.bitmap.array[y:y + height, x:x + width]
+        )
+
+    def DeleteDC(self):
+        pass
+
+
+def stub_modules(pixels):
+    """
+    Generate stand-ins for the win32 modules used by our window captures, every capture
+    of the window prints the (BGRX) pixels specified into the capture bitmap.
+    """
+    height, width = pixels.shape[:2]
+
+    win32gui = types.ModuleType("win32gui")
+    win32gui.GetWindowRect = lambda hwnd: (0, 0, width, height)
+    win32gui.GetWindowText = lambda hwnd: "Stub Emulator"
+    win32gui.GetWindowDC = lambda hwnd: hwnd
+    win32gui.ReleaseDC = lambda hwnd, dc: None
+    win32gui.DeleteObject = lambda handle: None
+
+    win32ui = types.ModuleType("win32ui")
+    win32ui.CreateDCFromHandle = lambda handle: StubDC()
+    win32ui.CreateBitmap = StubBitmap
+
+    win32con = types.ModuleType("win32con")
+    win32con.SRCCOPY = 0x00CC0020
+
+    for index, name in enumerate(["LBUTTON", "RBUTTON", "MBUTTON"]):
+        setattr(win32con, "WM_%sDOWN" % name, 0x0201 + index * 3)
+        setattr(win32con, "WM_%sUP" % name, 0x0202 + index * 3)
+    win32con.WM_MOUSEMOVE = 0x0200
+
+    win32api = types.ModuleType("win32api")
+    win32api.MAKELONG = lambda low, high: ((high & 0xFFFF) << 16) | (low & 0xFFFF)
+    win32api.SendMessage = lambda *args: None
+
+    def print_window(hwnd, dc, flags):
+        dc.bitmap.array[:] = pixels
+
+    windll = types.SimpleNamespace(user32=types.SimpleNamespace(PrintWindow=print_window))
+    modules = {
+        "win32gui": win32gui,
+        "win32ui": win32ui,
+        "win32con": win32con,
+        "win32api": win32api,
+    }
+    if importlib.util.find_spec("pyautogui") is None:
+        modules["pyautogui"] = types.ModuleType("pyautogui")
+
+    return modules, windll
+
+
+@pytest.fixture
+def stub_window():
+    """
+    Generate a window (with the y padding specified) backed by our stubbed win32 modules.
+    """
+    with mock.patch.dict(sys.modules):
+        def build(padding):
+            pixels = np.random.default_rng(seed=padding).integers(
+                0, 256, size=(EMULATOR_HEIGHT + padding, EMULATOR_WIDTH, 4), dtype=np.uint8,
+            )
+            modules, windll = stub_modules(pixels=pixels)
+            sys.modules.update(modules)
+            sys.modules.pop("bot.core.window", None)
+
+            with mock.patch.object(ctypes, "windll", windll, create=True):
+                window = importlib.import_module("bot.core.window").Window(hwnd=1)
+            return window, pixels
+
+        yield build
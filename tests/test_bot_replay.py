@@ -0,0 +1,46 @@
+"""
+Replay session tests, a bot session can be built on a replay source on any platform, without any of the win32
+(or pyautogui) functionality that's only needed by emulator windows.
+"""
+import numpy as np
+import pytest
+import cv2
+import os
+
+import bot.core.bot
+
+from bot.core.source import ReplaySource
+
+
+def test_bot_imports_without_pyautogui():
+    assert not hasattr(bot.core.bot, "pyautogui")
+    assert bot.core.bot.FailSafeException.__module__ == "bot.core.exceptions"
+
+
+@pytest.fixture
+def replay(tmp_path):
+    """
+    Generate a replay with a single frame, containing the travel shop icon at (120, 600).
+    """
+    frame = np.full((800, 480, 3), 32, dtype=np.uint8)
+    template = cv2.imread(os.path.join(bot.core.bot.BOT_DATA_IMAGES_DIRECTORY, "travel_shop_icon.png"))
+    frame[600:600 + template.shape[0], 120:120 + template.shape[1]] = template
+
+    cv2.imwrite(str(tmp_path / "0000.png"), frame)
+
+    return ReplaySource(path=str(tmp_path))
+
+
+def test_bot_session_on_replay(replay, session):
+    events = []
+    session = session(replay=replay, events=events)
+
+    assert session.window is replay
+    assert events
+
+    found, position, image = session.search(
+        image=session.files["travel_shop_icon"],
+        precision=0.95,
+    )
+    assert found
+    assert tuple(position) == (120, 600)
@@ -0,0 +1,129 @@
+"""
+Input dispatcher tests, inputs are sent in order on the dispatcher thread, while every failsafe and force stop
+check is made on the thread queueing the inputs.
+"""
+from concurrent.futures import CancelledError
+from threading import (
+    current_thread,
+    Thread,
+    Event,
+)
+
+import numpy as np
+import pytest
+import cv2
+
+from bot.core.bot import Bot
+from bot.core.dispatcher import InputDispatcher
+from bot.core.exceptions import StoppedException
+from bot.core.source import ReplaySource
+
+
+class ForceStop(object):
+    """
+    Stand-in for the gui force stop function, tracking the threads it's called from.
+    """
+    def __init__(self):
+        self.stop = False
+        self.threads = set()
+
+    def __call__(self, instance, _set=False):
+        self.threads.add(current_thread())
+
+        if _set:
+            self.stop = False
+        return self.stop
+
+
+@pytest.fixture
+def replay(tmp_path):
+    cv2.imwrite(str(tmp_path / "0000.png"), np.zeros((800, 480, 3), dtype=np.uint8))
+
+    source = ReplaySource(path=str(tmp_path))
+    source.configure(instance=1, get_settings_obj=None, force_stop_func=ForceStop())
+
+    return source
+
+
+@pytest.fixture
+def dispatcher(replay):
+    dispatcher = InputDispatcher(source=replay)
+    dispatcher.start()
+
+    yield dispatcher
+
+    dispatcher.stop()
+
+
+@pytest.fixture
+def bot(replay, dispatcher):
+    bot = Bot.__new__(Bot)
+    bot.window = replay
+    bot.dispatcher = dispatcher
+    bot.latency = None
+
+    return bot
+
+
+def test_inputs_are_sent_in_order(bot, replay):
+    handle = bot.taps(points=np.arange(20).reshape(-1, 2))
+    bot.click(point=(10, 10), offset=0)
+
+    assert handle.done()
+    assert [event for timestamp, event, parameters in replay.inputs] == ["taps", "click"]
+
+
+def test_checks_are_made_on_the_queueing_thread(bot, replay, dispatcher):
+    bot.taps(points=np.arange(20).reshape(-1, 2))
+    bot.flush()
+
+    assert replay.force_stop_func.threads == {current_thread()}
+    assert dispatcher not in replay.force_stop_func.threads
+
+
+def test_force_stop_raised_before_queueing(bot, replay):
+    replay.force_stop_func.stop = True
+
+    with pytest.raises(StoppedException):
+        bot.taps(points=np.arange(20).reshape(-1, 2))
+
+    # The force stop flag is reset by our own thread, and nothing was queued.
+    assert replay.force_stop_func.stop is False
+    assert replay.inputs == []
+
+
+def test_failed_input_raised_before_queueing(bot, replay, dispatcher):
+    def fail(**parameters):
+        raise StoppedException
+
+    replay.drag = fail
+    handle = bot._dispatch("drag", wait=False, start=(0, 0), end=(0, 10))
+
+    with pytest.raises(StoppedException):
+        handle.result()
+    with pytest.raises(StoppedException):
+        bot.taps(points=np.arange(20).reshape(-1, 2))
+    assert replay.inputs == []
+
+
+def test_stop_cancels_queued_inputs(replay):
+    dispatcher = InputDispatcher(source=replay)
+    blocked = Event()
+    replay.drag = lambda **parameters: blocked.wait()
+    dispatcher.start()
+
+    dispatcher.submit("drag", start=(0, 0), end=(0, 10))
+    queued = dispatcher.submit("click", point=(10, 10))
+
+    # Stopping while the drag is still being sent, the click queued after it is never sent.
+    stopping = Thread(target=dispatcher.stop)
+    stopping.start()
+    dispatcher.stopped.wait()
+    blocked.set()
+    stopping.join()
+
+    with pytest.raises(CancelledError):
+        queued.result(timeout=1)
+    with pytest.raises(RuntimeError):
+        dispatcher.submit("click", point=(10, 10))
+    assert replay.dispatcher is None
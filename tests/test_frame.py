@@ -0,0 +1,49 @@
+"""
+Frame tests, frame crops must behave the same way PIL crops did (including zero padding outside of the frame).
+"""
+from PIL import Image
+
+import numpy as np
+import warnings
+import pytest
+import cv2
+
+from bot.core.frame import Frame
+
+
+@pytest.fixture
+def array():
+    return np.random.default_rng(seed=0).integers(0, 256, size=(800, 480, 3), dtype=np.uint8)
+
+
+@pytest.mark.parametrize("box", [
+    (10, 10, 50, 60),
+    (-10, -5, 50, 60),
+    (400, 700, 500, 820),
+    (-20, -20, -5, -5),
+])
+def test_crop_matches_pil(array, box):
+    frame = Frame(array=array).crop(box=box)
+
+    # The origin of the crop is always the origin of the box, so positions
+    # found within the crop can be offset by the box to find the frame position.
+    assert frame.size == (box[2] - box[0], box[3] - box[1])
+    assert np.array_equal(frame.array, np.asarray(Image.fromarray(array).crop(box)))
+    assert np.array_equal(frame.gray, cv2.cvtColor(np.asarray(Image.fromarray(array).crop(box)), cv2.COLOR_BGR2GRAY))
+
+
+def test_crop_within_frame_is_a_view(array):
+    frame = Frame(array=array).crop(box=(10, 10, 50, 60))
+
+    assert np.shares_memory(frame.array, array)
+
+
+def test_array_protocol(array):
+    frame = Frame(array=array)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+
+        assert np.asarray(frame) is array
+        assert not np.shares_memory(np.array(frame, copy=True), array)
+        assert np.asarray(frame, dtype=np.float32).dtype == np.float32
@@ -0,0 +1,67 @@
+"""
+Frame cache tests, cached frames are shared until an input is sent or the frame expires, while retries always
+capture a new frame.
+"""
+import numpy as np
+import pytest
+import cv2
+
+from bot.core.source import ReplaySource
+
+
+@pytest.fixture
+def replay(tmp_path):
+    """
+    Generate a replay whose frames each have a different (solid) color.
+    """
+    replay = tmp_path / "replay"
+    replay.mkdir()
+
+    for index in range(4):
+        cv2.imwrite(str(replay / ("%04d.png" % index)), np.full((800, 480, 3), index * 50, dtype=np.uint8))
+    return ReplaySource(path=str(replay))
+
+
+@pytest.fixture
+def bot(replay, session):
+    bot = session(replay=replay)
+    # Frames never expire on their own during our tests.
+    bot.configurations["global"]["snapshot"]["frame_cache_max_age"] = 60000
+
+    return bot
+
+
+def test_frame_is_cached_between_inputs(bot, replay):
+    frame = bot.capture()
+
+    assert bot.capture() is frame
+    assert bot.capture(region=(0, 0, 10, 10)).array[0, 0, 0] == frame.array[0, 0, 0]
+
+    bot.click(point=(10, 10), offset=0)
+
+    assert bot.capture() is not frame
+
+
+def test_invalidate_captures_new_frame(bot, replay):
+    frame = bot.capture()
+    index = replay.index
+
+    bot.invalidate()
+
+    assert bot.capture() is not frame
+    assert replay.index == (index + 1) % len(replay.names)
+
+
+def test_retries_capture_new_frames(bot, replay):
+    frames = [bot.capture()]
+
+    count = 0
+    for _ in range(3):
+        count = bot.handle_timeout(count=count, timeout=3)
+        frames.append(bot.capture())
+
+    # Every retry saw a new frame, none of them were served from our cache.
+    assert len(set(frame.array[0, 0, 0] for frame in frames)) == 4
+
+    with pytest.raises(TimeoutError):
+        bot.handle_timeout(count=count, timeout=3)
@@ -0,0 +1,67 @@
+"""
+Location hint tests, hinted searches must find exactly what a full region search finds, falling back to the full
+region (at the same precision) whenever the template isn't found around its last location.
+"""
+from settings import BOT_DATA_IMAGES_DIRECTORY
+
+import os
+
+from bot.core.hints import LocationHints
+from bot.core.imagesearch import image_search_area
+from bot.core.templates import TemplateStore
+
+
+IMAGE = os.path.join(BOT_DATA_IMAGES_DIRECTORY, "travel_shop_icon.png")
+REGION = (0, 0, 480, 800)
+FRAMES = [
+    {"travel_shop_icon": (120, 600)},
+    # Moved outside of the hint window, the full region must still be searched.
+    {"travel_shop_icon": (300, 100)},
+    # Missing entirely.
+    {},
+    # Moved, but still within the hint window.
+    {"travel_shop_icon": (305, 104)},
+    {"large_exit": (300, 100)},
+]
+
+
+def test_hints_match_full_searches(replay_frames):
+    templates = TemplateStore()
+    hints = LocationHints(padding=10)
+    hinted, full = (
+        replay_frames(FRAMES, name="hinted"),
+        replay_frames(FRAMES, name="full"),
+    )
+    positions = [
+        (
+            image_search_area(hinted, IMAGE, *REGION, precision=0.9, templates=templates, hints=hints),
+            image_search_area(full, IMAGE, *REGION, precision=0.9, templates=templates),
+        )
+        for _ in FRAMES
+    ]
+    assert [tuple(hinted) for hinted, full in positions] == [tuple(full) for hinted, full in positions]
+    assert [tuple(hinted) for hinted, full in positions] == [(120, 600), (300, 100), (-1, -1), (305, 104), (-1, -1)]
+
+    # Only the search within the hint window was a hit, the searches that
+    # fell back to the full region (or found nothing) are all misses.
+    assert hints.stats["travel_shop_icon"]["hits"] == 1
+    assert hints.stats["travel_shop_icon"]["misses"] == 3
+    assert hints.locations[(IMAGE, REGION)] == (305, 104)
+
+
+def test_hints_keep_precision(replay_frames):
+    templates = TemplateStore()
+    hints = LocationHints(padding=10)
+    replay = replay_frames([{"travel_shop_icon": (120, 600)}, {"large_exit": (120, 600)}])
+
+    image_search_area(replay, IMAGE, *REGION, precision=0.9, templates=templates, hints=hints)
+    # Another template now sits where our hint is, a weaker match within the hint window is never
+    # returned in place of the full region result, which is still held to the precision specified.
+    im = replay.screenshot()
+
+    for precision in [0.3, 0.5, 0.9, 0.99]:
+        assert image_search_area(
+            replay, IMAGE, *REGION, precision=precision, im=im, templates=templates, hints=hints,
+        ) == image_search_area(
+            replay, IMAGE, *REGION, precision=precision, im=im, templates=templates,
+        ), precision
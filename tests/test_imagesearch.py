@@ -0,0 +1,83 @@
+"""
+Batched search tests, every template in a batch is matched against a single capture, and the first image found
+is always the first one (in list order) that's on the screen, whether or not the batch is run in parallel.
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from settings import BOT_DATA_IMAGES_DIRECTORY
+
+import pytest
+import os
+
+from bot.core.imagesearch import (
+    image_search_area,
+    image_search_batch,
+)
+from bot.core.templates import TemplateStore
+
+
+def path(name):
+    return os.path.join(BOT_DATA_IMAGES_DIRECTORY, "%s.png" % name)
+
+
+IMAGES = [
+    path("no_boss_icon"),
+    path("large_exit"),
+    path("travel_heroes_icon"),
+    path("travel_shop_icon"),
+]
+REGION = (0, 0, 480, 800)
+
+
+@pytest.fixture
+def replay(replay_frames):
+    replay = replay_frames([{"large_exit": (400, 20), "travel_shop_icon": (120, 600), "travel_heroes_icon": (40, 700)}])
+    replay.captures = 0
+    screenshot = replay.screenshot
+
+    def counted(*args, **kwargs):
+        replay.captures += 1
+        return screenshot(*args, **kwargs)
+
+    replay.screenshot = counted
+
+    return replay
+
+
+@pytest.fixture(params=[None, 4], ids=["serial", "parallel"])
+def executor(request):
+    if request.param is None:
+        yield None
+    else:
+        with ThreadPoolExecutor(max_workers=request.param) as executor:
+            yield executor
+
+
+def test_batch_first_hit_order(replay, executor):
+    templates = TemplateStore()
+
+    for _ in range(5):
+        matches = image_search_batch(replay, IMAGES, *REGION, templates=templates, executor=executor, first=True)
+
+        assert [image for image, score, position in matches] == [path("large_exit")]
+        assert tuple(matches[0][2]) == (400, 20)
+        # Reversing our list, the first image found is the last one on the screen.
+        matches = image_search_batch(replay, IMAGES[::-1], *REGION, templates=templates, executor=executor, first=True)
+
+        assert [image for image, score, position in matches] == [path("travel_shop_icon")]
+    assert replay.captures == 10
+
+
+def test_batch_matches_single_searches(replay, executor):
+    templates = TemplateStore()
+    matches = image_search_batch(replay, IMAGES, *REGION, templates=templates, executor=executor, first=False)
+
+    assert replay.captures == 1
+    # Every image found is returned (ranked by score), at the same
+    # position that's found when searching for it on its own.
+    assert sorted(image for image, score, position in matches) == sorted(IMAGES[1:])
+    assert [score for image, score, position in matches] == sorted(
+        (score for image, score, position in matches), reverse=True,
+    )
+    for image, score, position in matches:
+        assert tuple(position) == tuple(image_search_area(replay, image, *REGION, templates=templates))
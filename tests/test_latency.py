@@ -0,0 +1,72 @@
+"""
+Latency probe tests, probes poll a region of the source (never the full frame) at the configured interval, and
+sessions only probe (click) at startup.
+"""
+import numpy as np
+import time
+
+from bot.core.frame import Frame
+from bot.core.latency import LatencyProbe
+
+
+class ReactingSource(object):
+    """
+    Stand-in frame source whose region reacts to a click after the delay specified.
+    """
+    def __init__(self, delay):
+        self.delay = delay
+        self.clicked = None
+        self.regions = []
+
+    def click(self):
+        self.clicked = time.perf_counter()
+
+    def screenshot(self, region=None, refresh=True):
+        self.regions.append(region)
+
+        array = np.random.default_rng().integers(0, 3, size=(region[3] - region[1], region[2] - region[0], 3), dtype=np.uint8)
+
+        if self.clicked and time.perf_counter() - self.clicked > self.delay:
+            array[:] = 200
+        return Frame(array=array)
+
+
+REGION = (220, 100, 260, 140)
+
+
+def test_measure_polls_region():
+    probe = LatencyProbe()
+    source = ReactingSource(delay=0.05)
+
+    latency = probe.measure(source=source, click=source.click, region=REGION, timeout=1.0, interval=0.005)
+
+    assert 0.05 <= latency < 0.2
+    assert probe.estimate == latency
+    assert set(source.regions) == {REGION}
+
+
+def test_measure_waits_between_polls():
+    probe = LatencyProbe()
+    source = ReactingSource(delay=float("inf"))
+
+    assert probe.measure(source=source, click=source.click, region=REGION, timeout=0.2, interval=0.02) is None
+    assert probe.timeouts == 1
+    # Two captures before clicking, and at most one capture per interval afterwards.
+    assert len(source.regions) <= 2 + 0.2 / 0.02 + 1
+
+
+def test_probes_only_click_at_startup(replay_frames, session):
+    replay = replay_frames([{}])
+    bot = session(replay=replay)
+    bot.latency = LatencyProbe()
+    bot.configurations["global"]["latency"]["timeout"] = 0.01
+
+    inputs = len(replay.inputs)
+    bot.configure_latency()
+
+    clicks = replay.inputs[inputs:]
+    # Each probe is a single click on the main screen, nothing else is sent.
+    assert len(clicks) == bot.configurations["global"]["latency"]["startup_clicks"]
+    assert {(event, parameters["point"]) for timestamp, event, parameters in clicks} == {
+        ("click", tuple(bot.configurations["points"]["main_screen"]["top_middle"])),
+    }
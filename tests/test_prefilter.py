@@ -0,0 +1,60 @@
+"""
+Prefilter tests, signatures come from the template store, and a template that's on the screen is never rejected.
+"""
+from settings import BOT_DATA_IMAGES_DIRECTORY
+
+import pytest
+import os
+
+from bot.core.imagesearch import image_search_area
+from bot.core.prefilter import Prefilter
+from bot.core.templates import TemplateStore
+
+
+POSITION = (20, 40)
+
+
+@pytest.fixture(scope="module")
+def store():
+    store = TemplateStore()
+    store.load_directory(directory=BOT_DATA_IMAGES_DIRECTORY)
+
+    return store
+
+
+def test_signatures_from_store(store, monkeypatch):
+    prefilter = Prefilter(templates=store)
+    image = os.path.join(BOT_DATA_IMAGES_DIRECTORY, "travel_shop_icon.png")
+
+    # Every template is already in memory, nothing is read from disk.
+    monkeypatch.setattr("cv2.imread", lambda *args, **kwargs: pytest.fail("Template was read from disk."))
+
+    assert prefilter.signature(image=image).sum() == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("shadow", [True, False])
+def test_present_templates_never_rejected(store, replay_frames, shadow):
+    names = sorted(template.name for template in store.templates.values())
+    replay = replay_frames([{name: POSITION} for name in names], name="shadow" if shadow else "live")
+    prefilter = Prefilter(shadow=shadow, templates=store)
+
+    for name in names:
+        template = store.get(path=os.path.join(BOT_DATA_IMAGES_DIRECTORY, "%s.png" % name))
+        # Searching the area around the template, it's the only thing on the screen.
+        region = (
+            0,
+            0,
+            POSITION[0] + template.width + 20,
+            POSITION[1] + template.height + 20,
+        )
+        im = replay.screenshot(region=region)
+        # A template is on the screen when it's found without our prefilter, the
+        # prefilter must never change the result of a search for it.
+        assert image_search_area(
+            replay, template.path, *region, precision=0.8, im=im, templates=store, prefilter=prefilter,
+        ) == image_search_area(
+            replay, template.path, *region, precision=0.8, im=im, templates=store,
+        ), name
+
+    assert prefilter.checks == len(names)
+    assert prefilter.false_rejections == {}
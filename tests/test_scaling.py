@@ -0,0 +1,39 @@
+"""
+Scaling tests, every point, region and listed pixel value is scaled, while every other value is left as is.
+"""
+from settings import BOT_DATA_SCHEMA_CONFIGURATION_FILE
+
+import pytest
+import json
+
+from bot.core.scaling import scale_configurations
+
+
+@pytest.fixture
+def configurations():
+    with open(BOT_DATA_SCHEMA_CONFIGURATION_FILE) as file:
+        return json.load(file)
+
+
+def lookup(configurations, path):
+    for key in path.split("."):
+        configurations = configurations[key]
+    return configurations
+
+
+def test_scale_listed_pixels(configurations):
+    original = json.dumps(configurations)
+    scaled = scale_configurations(configurations=configurations, scale=1.5)
+
+    # The configurations passed in are never modified.
+    assert json.dumps(configurations) == original
+
+    for path in configurations["global"]["scale"]["pixels"]:
+        assert lookup(scaled, path) == round(lookup(configurations, path) * 1.5), path
+    assert scaled["points"]["main_screen"]["top_middle"] == [
+        round(value * 1.5) for value in configurations["points"]["main_screen"]["top_middle"]
+    ]
+    # Pauses, precisions, counts, etc are never scaled.
+    assert scaled["parameters"]["tap"]["pause"] == configurations["parameters"]["tap"]["pause"]
+    assert scaled["parameters"]["tap"]["tap_fairies_modulo"] == configurations["parameters"]["tap"]["tap_fairies_modulo"]
+    assert scaled["global"]["search"]["hints_enabled"] is True
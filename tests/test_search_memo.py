@@ -0,0 +1,69 @@
+"""
+Search memo tests, identical searches share a result while the frame is cached, inputs and retries always search
+a new frame.
+"""
+import pytest
+
+
+FRAMES = [
+    {},
+    {"travel_shop_icon": (120, 600)},
+    {"travel_shop_icon": (120, 600)},
+    {"travel_shop_icon": (120, 600)},
+]
+
+
+@pytest.fixture
+def replay(replay_frames):
+    return replay_frames(FRAMES)
+
+
+@pytest.fixture
+def bot(replay, session):
+    bot = session(replay=replay)
+    # Frames never expire on their own during our tests, only inputs
+    # and retries may cause a new frame to be searched.
+    bot.configurations["global"]["snapshot"]["frame_cache_max_age"] = 60000
+    # Starting over from our first frame (without the icon).
+    replay.index = -1
+    bot.invalidate()
+
+    return bot
+
+
+def search(bot):
+    return bot.search(image=bot.files["travel_shop_icon"], precision=0.9)[0]
+
+
+def test_memo_shared_between_inputs(bot, replay):
+    assert not search(bot)
+    assert not search(bot)
+    assert bot.search_cache_hits == 1
+    assert replay.index == 0
+
+    bot.click(point=(10, 10), offset=0)
+
+    assert search(bot)
+    assert replay.index == 1
+
+
+def test_find_and_click_retries_new_frames(bot, replay):
+    bot.find_and_click_image(
+        image=bot.files["travel_shop_icon"],
+        precision=0.9,
+        offset=0,
+        timeout=3,
+    )
+    # The icon appeared in our second frame, and was clicked once it was found.
+    assert replay.index == 1
+    assert bot.search_cache_hits == 0
+    assert [event for timestamp, event, parameters in replay.inputs] == ["click"]
+
+
+def test_search_retries_new_frames(bot, replay):
+    count = 0
+
+    while not search(bot):
+        count = bot.handle_timeout(count=count, timeout=3)
+    assert count == 1
+    assert replay.index == 1
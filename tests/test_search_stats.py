@@ -0,0 +1,60 @@
+"""
+Search stats tests, hints and prefilters are shared by every search worker, so no updates may be lost when
+many workers use them at once.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import numpy as np
+import os
+
+from bot.core.hints import LocationHints
+from bot.core.prefilter import Prefilter
+
+
+IMAGE = os.path.join(os.path.dirname(__file__), os.pardir, "bot", "data", "images", "travel_shop_icon.png")
+WORKERS = 8
+SEARCHES = 500
+
+
+def test_hints_stats_under_contention():
+    hints = LocationHints(padding=2)
+    img_gray = np.zeros((100, 100), dtype=np.uint8)
+    template = np.zeros((10, 10), dtype=np.uint8)
+    # Every search is found at the same position, each worker uses
+    # its own region, so every search after the first is a hit.
+    regions = [(worker, 0, 100, 100) for worker in range(WORKERS)]
+
+    def search(region):
+        for _ in range(SEARCHES):
+            hints.match(
+                image=IMAGE,
+                region=region,
+                img_gray=img_gray,
+                template=template,
+                precision=0.8,
+                match=lambda gray: (1.0, (2, 2)),
+            )
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        list(executor.map(search, regions))
+
+    assert hints.hits == WORKERS * (SEARCHES - 1)
+    assert hints.misses == 0
+
+
+def test_prefilter_counts_under_contention():
+    prefilter = Prefilter()
+    img_gray = np.zeros((100, 100), dtype=np.uint8)
+    template = SimpleNamespace(size=100)
+
+    def search(worker):
+        for _ in range(SEARCHES):
+            if not prefilter.possible(image=IMAGE, img_gray=img_gray, template=template):
+                prefilter.false_rejection(image=IMAGE)
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        list(executor.map(search, range(WORKERS)))
+
+    assert prefilter.checks == WORKERS * SEARCHES
+    assert prefilter.rejected == sum(prefilter.false_rejections.values())
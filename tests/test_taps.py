@@ -0,0 +1,87 @@
+"""
+Tap schedule tests, schedules are compiled from the configured tap map, split into segments at every checkpoint,
+and never tap within the prevent region (jitter included).
+"""
+from settings import BOT_DATA_SCHEMA_CONFIGURATION_FILE
+
+import numpy as np
+import pytest
+import json
+
+from bot.core.taps import TapSchedule
+
+
+CHECKPOINTS = {
+    "fairies": 15,
+    "collapse": 8,
+}
+
+
+@pytest.fixture(scope="module")
+def configurations():
+    with open(BOT_DATA_SCHEMA_CONFIGURATION_FILE) as file:
+        return json.load(file)
+
+
+def compile_schedule(configurations, seed, prevent_region=None):
+    return TapSchedule.compile(
+        tap_map=configurations["points"]["tap"]["tap_map"],
+        heroes_loops=configurations["parameters"]["tap"]["tap_heroes_loops"],
+        heroes_remove_percent=configurations["parameters"]["tap"]["tap_heroes_remove_percent"],
+        offset_min=configurations["parameters"]["tap"]["offset_min"],
+        offset_max=configurations["parameters"]["tap"]["offset_max"],
+        prevent_region=prevent_region,
+        checkpoints=CHECKPOINTS,
+        rng=np.random.default_rng(seed),
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_segments_split_at_checkpoints(configurations, replay_frames, seed):
+    schedule = compile_schedule(configurations=configurations, seed=seed)
+    replay = replay_frames([{}])
+    start = 0
+
+    for checkpoints, segment in schedule.segments():
+        assert checkpoints == [name for name, modulo in CHECKPOINTS.items() if start % modulo == 0]
+        assert checkpoints or start == 0
+        replay.taps(points=segment)
+        start += len(segment)
+
+    # Every point is tapped exactly once, in order, with every segment ending at the next checkpoint.
+    assert start == len(schedule)
+    assert np.concatenate([parameters["points"] for timestamp, event, parameters in replay.inputs]).tolist() == (
+        schedule.points.tolist()
+    )
+    assert max(len(parameters["points"]) for timestamp, event, parameters in replay.inputs) <= min(CHECKPOINTS.values())
+
+
+def inside(points, region):
+    return (
+        (region[0] <= points[:, 0]) & (points[:, 0] <= region[2])
+        & (region[1] <= points[:, 1]) & (points[:, 1] <= region[3])
+    )
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_prevent_region_after_jitter(configurations, seed):
+    region = configurations["regions"]["tap"]["one_time_offer_prevent_area"]
+    points = compile_schedule(configurations=configurations, seed=seed, prevent_region=region).points
+
+    assert not inside(points=points, region=region).any()
+
+
+def test_points_never_jittered_into_prevent_region():
+    region = (100, 100, 200, 200)
+    # Every point sits just outside of our region, within jitter range of it.
+    ring = [(x, 97) for x in range(100, 201, 5)] + [(203, y) for y in range(100, 201, 5)]
+    schedule = TapSchedule.compile(
+        tap_map={"fairies": ring * 20, "heroes": [], "pet": [], "master": []},
+        heroes_loops=0,
+        offset_min=6,
+        offset_max=6,
+        prevent_region=region,
+        rng=np.random.default_rng(0),
+    )
+    assert 0 < len(schedule) < len(ring) * 20
+    assert not inside(points=schedule.points, region=region).any()
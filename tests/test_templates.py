@@ -0,0 +1,64 @@
+"""
+Template store tests, templates held in memory must be identical to the images read from disk.
+"""
+from settings import BOT_DATA_IMAGES_DIRECTORY
+
+import numpy as np
+import pytest
+import cv2
+import os
+
+from bot.core.imagesearch import (
+    image_search_area,
+    click_image,
+)
+from bot.core.templates import TemplateStore
+
+
+@pytest.fixture(scope="module")
+def store():
+    store = TemplateStore()
+    store.load_directory(directory=BOT_DATA_IMAGES_DIRECTORY)
+
+    return store
+
+
+def test_store_matches_disk_reads(store):
+    paths = [
+        entry.path for entry in os.scandir(BOT_DATA_IMAGES_DIRECTORY) if entry.name.lower().endswith(store.EXTENSIONS)
+    ]
+    assert len(store) == len(paths)
+    assert store.nbytes == sum(cv2.imread(path, 0).nbytes * 2 for path in paths)
+
+    for path in paths:
+        template = store.get(path=path)
+        gray = cv2.imread(path, 0)
+
+        assert np.array_equal(template.gray, gray), path
+        assert np.array_equal(template.frame_gray, cv2.cvtColor(cv2.imread(path), cv2.COLOR_RGB2GRAY)), path
+        assert (template.height, template.width) == gray.shape, path
+
+
+def test_store_search_matches_disk_search(store, replay_frames):
+    replay = replay_frames([{"travel_shop_icon": (120, 600), "large_exit": (400, 20)}])
+    region = (0, 0, 480, 800)
+
+    for name in ["travel_shop_icon", "large_exit", "no_boss_icon"]:
+        path = os.path.join(BOT_DATA_IMAGES_DIRECTORY, "%s.png" % name)
+
+        assert image_search_area(
+            replay, path, *region, precision=0.9, templates=store,
+        ) == image_search_area(
+            replay, path, *region, precision=0.9,
+        ), name
+
+
+def test_store_click_matches_disk_click(store, replay_frames):
+    replay = replay_frames([{}])
+    path = os.path.join(BOT_DATA_IMAGES_DIRECTORY, "travel_shop_icon.png")
+
+    click_image(replay, path, position=(120, 600), button="left", offset=0, templates=store)
+    click_image(replay, path, position=(120, 600), button="left", offset=0)
+
+    points = [parameters["point"] for timestamp, event, parameters in replay.inputs]
+    assert points == [(120 + 45 // 2, 600 + 37 // 2)] * 2
@@ -0,0 +1,101 @@
+"""
+Region capture parity tests, a region copied out of a window capture (screenshot(region=...)) must contain
+exactly the same pixels as the same region cropped out of a full screenshot (screenshot().crop(...)).
+
+The stubbed tests run anywhere, the win32 capture calls are replaced with NumPy backed stand-ins. The live test
+only runs on Windows, against the emulator window whose title is set in the TEST_WINDOW_TITLE variable.
+"""
+import numpy as np
+import pytest
+import json
+import sys
+import os
+
+
+SCHEMA = os.path.join(os.path.dirname(__file__), os.pardir, "bot", "data", "schema", "schema.json")
+from conftest import (
+    EMULATOR_WIDTH,
+    EMULATOR_HEIGHT,
+)
+
+
+def schema_regions():
+    """
+    Retrieve every (name, region) configured in the schema.
+    """
+    with open(SCHEMA) as file:
+        regions = json.load(file)["regions"]
+
+    def walk(value, name):
+        if isinstance(value, dict):
+            for key, child in value.items():
+                yield from walk(child, "%s.%s" % (name, key) if name else key)
+        elif isinstance(value, list) and len(value) == 4 and all(isinstance(v, int) for v in value):
+            yield name, tuple(value)
+
+    return list(walk(regions, ""))
+
+
+@pytest.mark.parametrize("padding", [0, 32, 39])
+def test_region_parity_stubbed(stub_window, padding):
+    window, pixels = stub_window(padding=padding)
+    assert window.y_padding == padding
+
+    full = window.screenshot()
+    assert full.size == (EMULATOR_WIDTH, EMULATOR_HEIGHT)
+
+    for name, region in schema_regions():
+        frame = window.screenshot(region=region, refresh=False)
+        expected = full.crop(box=region)
+
+        assert frame.size == expected.size, name
+        assert np.array_equal(frame.array, expected.array), name
+        # Both paths must also match the pixels printed into the window, offset by the y padding.
+        assert np.array_equal(
+            frame.array,
+            pixels[region[1] + padding:region[3] + padding, region[0]:region[2], 2::-1],
+        ), name
+
+
+def test_geometry_max_age_stubbed(stub_window):
+    window, pixels = stub_window(padding=0)
+    window.geometry_max_age = 60
+
+    calls = []
+    win32gui = sys.modules["win32gui"]
+    rectangle = win32gui.GetWindowRect
+    win32gui.GetWindowRect = lambda hwnd: calls.append(hwnd) or rectangle(hwnd)
+
+    # Inputs share the cached geometry until it's older than the max age.
+    window.rectangle, window.rectangle
+    assert len(calls) == 1
+    # Every new capture refreshes it, re-reading the last capture doesn't.
+    window.screenshot()
+    window.screenshot(refresh=False)
+    window.rectangle
+    assert len(calls) == 2
+
+    window.geometry_max_age = 0
+    window.rectangle
+    assert len(calls) == 3
+
+
+@pytest.mark.skipif(sys.platform != "win32", reason="Live window captures require Windows.")
+@pytest.mark.skipif(not os.environ.get("TEST_WINDOW_TITLE"), reason="TEST_WINDOW_TITLE is not set.")
+def test_region_parity_live():
+    from bot.core.window import WindowHandler
+
+    window = WindowHandler().filter_first(filter_title=os.environ["TEST_WINDOW_TITLE"])
+    window.emulator_width, window.emulator_height = EMULATOR_WIDTH, EMULATOR_HEIGHT
+
+    try:
+        # The region captures re-read the same capture as our full screenshot,
+        # so any animations in game can't cause a difference between them.
+        full = window.screenshot()
+
+        for name, region in schema_regions():
+            frame = window.screenshot(region=region, refresh=False)
+
+            assert np.array_equal(frame.array, full.crop(box=region).array), name
+    finally:
+        window.release()
@@ -0,0 +1,140 @@
+"""
+Window input tests, drags sent to a (stubbed) win32 window begin and end at the same points whether they're
+interpolated over a duration or moved one pixel at a time, and circular drags follow the original per-degree
+path, checking for a force stop before every circle.
+"""
+from threading import current_thread
+from types import SimpleNamespace
+
+import pytest
+import math
+import sys
+
+from bot.core.dispatcher import InputDispatcher
+from bot.core.exceptions import StoppedException
+from bot.core.paths import circle_path
+
+
+@pytest.fixture
+def window(stub_window):
+    window, pixels = stub_window(padding=32)
+    window.configure(
+        instance=1,
+        get_settings_obj=lambda: SimpleNamespace(failsafe=False),
+        force_stop_func=None,
+    )
+    window.messages = []
+    sys.modules["win32api"].SendMessage = lambda hwnd, message, wparam, lparam: window.messages.append(
+        (message, wparam, lparam)
+    )
+    return window
+
+
+def unpack(lparam):
+    return lparam & 0xFFFF, lparam >> 16
+
+
+@pytest.mark.parametrize("start, end", [
+    ((240, 600), (240, 200)),
+    ((240, 200), (240, 600)),
+    ((100, 500), (100, 499)),
+])
+def test_drag_endpoints(window, start, end):
+    window.drag(start=start, end=end)
+    pixels = window.messages
+    window.messages = []
+    window.drag(start=start, end=end, duration=0.01, steps=15, easing="ease_out")
+    interpolated = window.messages
+
+    # Both drags press at the start point, and release their last move at the end point.
+    assert pixels[0] == interpolated[0]
+    assert pixels[-1] == interpolated[-1]
+    assert unpack(interpolated[0][2]) == (start[0], start[1] + window.y_padding)
+    assert unpack(interpolated[-1][2]) == (end[0], end[1] + window.y_padding)
+    assert interpolated[-1][1] == 0
+    # Interpolated moves are all within the line between our start and end points.
+    for message, wparam, lparam in interpolated[1:-1]:
+        x, y = unpack(lparam)
+
+        assert x == start[0]
+        assert min(start[1], end[1]) + window.y_padding <= y <= max(start[1], end[1]) + window.y_padding
+
+
+def test_drags_default_to_pixels(replay_frames, session):
+    replay = replay_frames([{}])
+    bot = session(replay=replay)
+
+    bot.drag(start=(240, 600), end=(240, 200))
+
+    timestamp, event, parameters = replay.inputs[-1]
+
+    assert event == "drag"
+    assert parameters["duration"] is None
+
+
+def legacy_circle(center, radius, loops, scale):
+    """
+    Generate the points of a circular drag, one degree at a time, the way circular drags were originally sent.
+    """
+    points = []
+
+    for loop in range(loops):
+        if loop != 0:
+            radius = radius * scale
+        for i in range(360):
+            if i % 3 == 0:
+                continue
+            points.append((
+                int(center[0] + radius * math.cos(math.radians(i))),
+                int(center[1] + radius * math.sin(math.radians(i))),
+            ))
+    return points
+
+
+@pytest.mark.parametrize("radius", [30, 100, 123.4])
+@pytest.mark.parametrize("scale", [0.7, 0.5, 1.2])
+def test_circle_path_parity(radius, scale):
+    path = circle_path(center=(240, 440), radius=radius, loops=5, scale=scale)
+
+    assert path.reshape(-1, 2).tolist() == [list(point) for point in legacy_circle((240, 440), radius, 5, scale)]
+    # Cached paths are shared, so they may never be modified.
+    assert circle_path(center=(240, 440), radius=radius, loops=5, scale=scale) is path
+    assert not path.flags.writeable
+
+
+def test_drag_circle_messages(window):
+    window.drag_circle(radius=100, offset=0, interval=0)
+
+    moves = [unpack(lparam) for message, wparam, lparam in window.messages if message == 0x0200 and wparam == 1]
+    legacy = legacy_circle((240, 440), 100, 5, 0.7)
+
+    assert [(x, y - window.y_padding) for x, y in moves] == legacy
+    # Every circle is let go of at its last point.
+    assert len(window.messages) == 1 + len(legacy) + 5 * 2
+
+
+def test_drag_circle_stopped_per_circle(window):
+    dispatcher = InputDispatcher(source=window)
+    checks = []
+
+    def force_stop(instance, _set=False):
+        checks.append(current_thread())
+        # Stopping once our first circle has been sent.
+        return len(window.messages) > 1
+
+    window.force_stop_func = force_stop
+    dispatcher.start()
+
+    try:
+        handle = dispatcher.submit("drag_circle", radius=100, offset=0, interval=0)
+
+        with pytest.raises(StoppedException):
+            handle.result(timeout=5)
+    finally:
+        dispatcher.stop()
+
+    # Only our first circle was sent, checks were made on the dispatcher thread, and
+    # the force stop was never reset there.
+    assert len(window.messages) == 1 + 240 + 2
+    assert set(checks) == {dispatcher}
+    assert force_stop(instance=1)